@@ -7,40 +7,63 @@ from dotenv import load_dotenv
 
 from .database import db
 from .extensions import jwt
+from .helpers.pincode import init_pincode_index
+from .helpers.json_provider import OrjsonProvider
+from .helpers.cache import cache
+from .helpers.metrics import init_metrics
+from .helpers.indexes import ensure_extensions_command, ensure_indexes_command, check_query_plans_command
+from .helpers.summaries import rebuild_summaries_command
 
 from .models.candidates import Candidate
 from .models.assessment import Assessment
 from .models.attendance import Attendance
 from .models.business import Business
+from .models.table_version import TableVersion
+from .models.import_job import ImportJob
+from .models.candidate_count import CandidateCount
+from .models.attendance_daily import AttendanceDaily
 
 from .api.candidate import candidate_bp
 from .api.attendance import attendance_bp
 from .api.assessment import assessment_bp
 from .api.business import business_bp
+from .api.stats import stats_bp
+from .api.imports import imports_bp
 
 
 load_dotenv()
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     app.config.from_object('app.config.Config')
-    app.config['DEBUG'] = True
     app.config['JWT_SECRET_KEY'] = os.environ.get("SECRET_KEY", "supersecretkey")
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=8)
 
     CORS(app, origins="*", supports_credentials=True)
 
-    # Init extensions
+    # Init extensions (metrics first: it sets the engine's pool class)
+    init_metrics(app)
     db.init_app(app)
     Migrate(app, db)
     jwt.init_app(app)
+    init_pincode_index(app)
+    cache.max_entries = app.config["CACHE_MAX_ENTRIES"]
 
     # Register API Blueprints here
     app.register_blueprint(candidate_bp)
     app.register_blueprint(attendance_bp)
     app.register_blueprint(assessment_bp)
     app.register_blueprint(business_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(imports_bp)
+
+    # Schema maintenance commands
+    app.cli.add_command(ensure_extensions_command)
+    app.cli.add_command(ensure_indexes_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(rebuild_summaries_command)
     # from .api.candidate import candidate_bp
     # app.register_blueprint(candidate_bp)
 
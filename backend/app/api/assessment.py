@@ -3,14 +3,25 @@ from pydantic import BaseModel, ValidationError
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.exc import SQLAlchemyError
+import uuid
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.database import db
 from app.models.assessment import Assessment
-from app.models.candidates import Candidate
+from app.helpers.pagination import apply_filters, paginate
+from app.helpers.batch import create_batch, load_targets, apply_bulk_update
+from app.helpers.utils import is_foreign_key_violation
+from app.helpers.export import export_response
+from app.helpers.versioning import versioned
 
 assessment_bp = Blueprint("assessment_bp", __name__, url_prefix="/api/v1/assessment")
 
+# Columns returned by the list endpoint, fetched as plain tuples
+LIST_COLUMNS = (
+    Assessment.id, Assessment.candidate_id, Assessment.training, Assessment.date,
+    Assessment.status, Assessment.mark, Assessment.remarks, Assessment.created_at,
+)
+
 
 # --- Pydantic Validation Schema ---
 class AssessmentSchema(BaseModel):
@@ -28,11 +39,10 @@ def create_assessment():
     try:
         data = AssessmentSchema(**request.json)
 
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid Candidate ID"}), 400
-
+        # The candidate_id foreign key validates the candidate on INSERT
+        new_id = uuid.uuid4()
         new_assessment = Assessment(
+            id=new_id,
             candidate_id=data.candidate_id,
             training=data.training,
             date=datetime.strptime(data.date, "%Y-%m-%d") if data.date else datetime.utcnow(),
@@ -44,34 +54,72 @@ def create_assessment():
         db.session.add(new_assessment)
         db.session.commit()
 
-        return jsonify({"message": "Assessment recorded successfully", "id": str(new_assessment.id)}), 201
+        return jsonify({"message": "Assessment recorded successfully", "id": str(new_id)}), 201
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid Candidate ID"}), 400
+        return jsonify({"error": str(e)}), 500
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def build_assessment_row(data):
+    """Column values for one validated AssessmentSchema (create-batch and imports)"""
+    return {
+        "candidate_id": data.candidate_id,
+        "training": data.training,
+        "date": datetime.strptime(data.date, "%Y-%m-%d") if data.date else datetime.utcnow(),
+        "status": data.status,
+        "mark": data.mark,
+        "remarks": data.remarks,
+    }
+
+
+# --- POST: Create many assessments in one transaction ---
+@assessment_bp.route("/create-batch", methods=["POST"])
+def create_assessment_batch():
+    try:
+        body, status = create_batch(Assessment, AssessmentSchema, build_assessment_row, request.json)
+        return jsonify(body), status
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
-# --- GET: All assessments ---
+# --- GET: Assessments (keyset paginated) ---
+# Query params: limit, cursor, order, candidate_id, status, gender, district, date_from, date_to
 @assessment_bp.route("/get-all", methods=["GET"])
+@versioned("assessment", "candidates")
 def get_all_assessments():
-    assessments = Assessment.query.all()
-    return jsonify([
-        {
-            "id": str(a.id),
-            "candidate_id": str(a.candidate_id),
-            "training": a.training,
-            "date": a.date.strftime("%Y-%m-%d"),
-            "status": a.status,
-            "mark": a.mark,
-            "remarks": a.remarks
-        } for a in assessments
-    ]), 200
+    try:
+        query = apply_filters(db.session.query(*LIST_COLUMNS), Assessment, request.args)
+        rows, next_cursor = paginate(query, Assessment, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # The JSON provider serializes UUIDs and dates as fetched
+    return jsonify({"items": [row._asdict() for row in rows], "next_cursor": next_cursor}), 200
+
+
+# --- GET: Stream assessments as NDJSON or CSV ---
+# Query params: format (ndjson | csv), include_candidate, plus the get-all filters
+@assessment_bp.route("/export", methods=["GET"])
+@versioned("assessment", "candidates")
+def export_assessments():
+    try:
+        return export_response(Assessment, request.args, "assessment")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 # --- GET BY ID ---
 @assessment_bp.route("/get/<uuid:assessment_id>", methods=["GET"])
+@versioned("assessment")
 def get_assessment_by_id(assessment_id):
     assessment = Assessment.query.get(assessment_id)
     if not assessment:
@@ -89,31 +137,43 @@ def get_assessment_by_id(assessment_id):
 
 
 # --- PUT: Bulk update (optional) ---
+# Each item names its record by `id`, or by `candidate_id` (earliest record)
 @assessment_bp.route("/update-all", methods=["PUT"])
 def bulk_update_assessment():
     data = request.json
     if not isinstance(data, list):
         return jsonify({"error": "Expected array of objects"}), 400
 
-    updated = 0
-    for item in data:
+    targets, errors = load_targets(Assessment, data)
+    updates = {}
+    for index, record in targets.items():
         try:
-            validated = AssessmentSchema(**item)
-            record = Assessment.query.filter_by(candidate_id=validated.candidate_id).first()
-
-            if record:
-                if validated.date:
-                    record.date = datetime.strptime(validated.date, "%Y-%m-%d")
-                record.training = validated.training
-                record.status = validated.status
-                record.mark = validated.mark
-                record.remarks = validated.remarks
-                updated += 1
-        except:
-            continue
+            validated = AssessmentSchema(**{**data[index], "candidate_id": record.candidate_id})
+            updates[index] = {
+                "id": record.id,
+                "training": validated.training,
+                "date": datetime.strptime(validated.date, "%Y-%m-%d") if validated.date else record.date,
+                "status": validated.status,
+                "mark": validated.mark,
+                "remarks": validated.remarks,
+            }
+        except ValidationError as e:
+            errors[index] = e.errors()
+        except ValueError as e:
+            errors[index] = str(e)
 
-    db.session.commit()
-    return jsonify({"message": f"{updated} assessment records updated"}), 200
+    try:
+        updated, results = apply_bulk_update(Assessment, data, updates, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "message": f"{updated} assessment records updated",
+        "updated": updated,
+        "failed": len(data) - updated,
+        "results": results,
+    }), 200
 
 
 # --- PUT BY ID ---
@@ -126,10 +186,6 @@ def update_assessment(assessment_id):
     try:
         data = AssessmentSchema(**request.json)
 
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid Candidate ID"}), 400
-
         record.candidate_id = data.candidate_id
         record.training = data.training
         record.date = datetime.strptime(data.date, "%Y-%m-%d") if data.date else record.date
@@ -142,6 +198,11 @@ def update_assessment(assessment_id):
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid Candidate ID"}), 400
+        return jsonify({"error": str(e)}), 500
 
 
 # --- DELETE: All assessments ---
@@ -1,16 +1,28 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from pydantic import BaseModel, ValidationError
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.exc import SQLAlchemyError
+import uuid
+from sqlalchemy import func, tuple_, true
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.database import db
 from app.models.attendance import Attendance
-from app.models.candidates import Candidate
+from app.helpers.pagination import apply_filters, paginate, parse_date
+from app.helpers.utils import is_foreign_key_violation
+from app.helpers.export import export_response
+from app.helpers.batch import create_batch, load_targets, apply_bulk_update
+from app.helpers.versioning import cached_for_versions, versioned
 
 attendance_bp = Blueprint("attendance_bp", __name__, url_prefix="/api/v1/attendance")
 
+# Columns returned by the list endpoint, fetched as plain tuples
+LIST_COLUMNS = (
+    Attendance.id, Attendance.candidate_id, Attendance.session_name, Attendance.attended,
+    Attendance.date, Attendance.remarks, Attendance.created_at,
+)
+
 
 # --- Pydantic Validation Schema ---
 class AttendanceSchema(BaseModel):
@@ -27,12 +39,10 @@ def create_attendance():
     try:
         data = AttendanceSchema(**request.json)
 
-        # Validate candidate
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid Candidate ID"}), 400
-
+        # The candidate_id foreign key validates the candidate on INSERT
+        new_id = uuid.uuid4()
         new_attendance = Attendance(
+            id=new_id,
             candidate_id=data.candidate_id,
             session_name=data.session_name,
             attended=data.attended,
@@ -42,33 +52,142 @@ def create_attendance():
 
         db.session.add(new_attendance)
         db.session.commit()
-        return jsonify({"message": "Attendance added successfully", "id": str(new_attendance.id)}), 201
+        return jsonify({"message": "Attendance added successfully", "id": str(new_id)}), 201
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid Candidate ID"}), 400
+        return jsonify({"error": str(e)}), 500
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def build_attendance_row(data):
+    """Column values for one validated AttendanceSchema (create-batch and imports)"""
+    return {
+        "candidate_id": data.candidate_id,
+        "session_name": data.session_name,
+        "attended": data.attended,
+        "date": datetime.strptime(data.date, "%Y-%m-%d") if data.date else datetime.utcnow(),
+        "remarks": data.remarks,
+    }
+
+
+# --- POST: Create many attendance records in one transaction ---
+@attendance_bp.route("/create-batch", methods=["POST"])
+def create_attendance_batch():
+    try:
+        body, status = create_batch(Attendance, AttendanceSchema, build_attendance_row, request.json)
+        return jsonify(body), status
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
-# --- GET: Get all attendance records ---
+# --- GET: Attendance records (keyset paginated) ---
+# Query params: limit, cursor, order, session, candidate_id, status, gender, district, date_from, date_to
 @attendance_bp.route("/get-all", methods=["GET"])
+@versioned("attendance", "candidates")
 def get_all_attendance():
-    records = Attendance.query.all()
-    return jsonify([
-        {
-            "id": str(a.id),
-            "candidate_id": str(a.candidate_id),
-            "session_name": a.session_name,
-            "attended": a.attended,
-            "date": a.date.strftime("%Y-%m-%d"),
-            "remarks": a.remarks
-        } for a in records
-    ]), 200
+    try:
+        query = apply_filters(db.session.query(*LIST_COLUMNS), Attendance, request.args)
+        rows, next_cursor = paginate(query, Attendance, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # The JSON provider serializes UUIDs and dates as fetched
+    return jsonify({"items": [row._asdict() for row in rows], "next_cursor": next_cursor}), 200
+
+
+# --- GET: Stream attendance as NDJSON or CSV ---
+# Query params: format (ndjson | csv), include_candidate, plus the get-all filters
+@attendance_bp.route("/export", methods=["GET"])
+@versioned("attendance", "candidates")
+def export_attendance():
+    try:
+        return export_response(Attendance, request.args, "attendance")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def compute_session_stats(date_from=None, date_to=None, session=None):
+    """
+    Attended/absent counts per session and per (session, date) in one
+    GROUPING SETS query over the expanded session_name arrays.
+    """
+    sessions = func.jsonb_array_elements_text(Attendance.session_name).table_valued("value").render_derived("s")
+    session_col = sessions.c.value
+
+    query = (
+        db.session.query(
+            session_col,
+            Attendance.date,
+            func.grouping(Attendance.date),
+            func.count().filter(Attendance.attended.is_(True)),
+            func.count().filter(Attendance.attended.is_(False)),
+            func.count(Attendance.candidate_id.distinct()),
+        )
+        .select_from(Attendance)
+        .join(sessions, true())
+        # Rows saved without sessions hold a JSON null, which cannot be expanded
+        .filter(func.jsonb_typeof(Attendance.session_name) == "array")
+    )
+    if session:
+        query = query.filter(Attendance.session_name.contains([session]), session_col == session)
+    if date_from:
+        query = query.filter(Attendance.date >= date_from)
+    if date_to:
+        query = query.filter(Attendance.date <= date_to)
+
+    query = query.group_by(func.grouping_sets(tuple_(session_col), tuple_(session_col, Attendance.date)))
+
+    by_session = {}
+    for name, day, is_total, attended, absent, candidates in query.all():
+        entry = by_session.setdefault(name, {"session": name, "dates": []})
+        counts = {"attended": attended, "absent": absent, "candidates": candidates}
+        if is_total:
+            entry.update(counts)
+        else:
+            entry["dates"].append({"date": day.strftime("%Y-%m-%d"), **counts})
+
+    for entry in by_session.values():
+        entry["dates"].sort(key=lambda d: d["date"])
+    return {"sessions": sorted(by_session.values(), key=lambda e: e["session"])}
+
+
+# --- GET: Per-session attendance rollups ---
+# Query params: session, date_from, date_to
+@attendance_bp.route("/stats", methods=["GET"])
+@versioned("attendance")
+def get_attendance_stats():
+    args = request.args
+    try:
+        date_from = parse_date(args["date_from"], "date_from") if args.get("date_from") else None
+        date_to = parse_date(args["date_to"], "date_to") if args.get("date_to") else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    session = args.get("session") or None
+
+    try:
+        stats = cached_for_versions(
+            f"stats:attendance:{session}:{date_from}:{date_to}",
+            ("attendance",),
+            current_app.config.get("STATS_CACHE_TTL", 5),
+            lambda: compute_session_stats(date_from, date_to, session),
+        )
+        return jsonify(stats), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
 
 # --- GET BY ID ---
 @attendance_bp.route("/get/<uuid:attendance_id>", methods=["GET"])
+@versioned("attendance")
 def get_attendance_by_id(attendance_id):
     record = Attendance.query.get(attendance_id)
     if not record:
@@ -85,31 +204,42 @@ def get_attendance_by_id(attendance_id):
 
 
 # --- PUT: Bulk update (optional) ---
+# Each item names its record by `id`, or by `candidate_id` (earliest record)
 @attendance_bp.route("/update-all", methods=["PUT"])
 def update_attendance_bulk():
     data = request.json
     if not isinstance(data, list):
         return jsonify({"error": "Expected list of attendance objects"}), 400
 
-    updated = 0
-    for item in data:
+    targets, errors = load_targets(Attendance, data)
+    updates = {}
+    for index, record in targets.items():
         try:
-            validated = AttendanceSchema(**item)
-            record = Attendance.query.get(validated.candidate_id)
-
-            if record:
-                if validated.date:
-                    record.date = datetime.strptime(validated.date, "%Y-%m-%d")
+            validated = AttendanceSchema(**{**data[index], "candidate_id": record.candidate_id})
+            updates[index] = {
+                "id": record.id,
+                "session_name": validated.session_name,
+                "attended": validated.attended,
+                "date": datetime.strptime(validated.date, "%Y-%m-%d") if validated.date else record.date,
+                "remarks": validated.remarks,
+            }
+        except ValidationError as e:
+            errors[index] = e.errors()
+        except ValueError as e:
+            errors[index] = str(e)
 
-                record.session_name = validated.session_name
-                record.attended = validated.attended
-                record.remarks = validated.remarks
-                updated += 1
-        except Exception:
-            continue
+    try:
+        updated, results = apply_bulk_update(Attendance, data, updates, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-    db.session.commit()
-    return jsonify({"message": f"{updated} attendance records updated"}), 200
+    return jsonify({
+        "message": f"{updated} attendance records updated",
+        "updated": updated,
+        "failed": len(data) - updated,
+        "results": results,
+    }), 200
 
 
 # --- PUT BY ID ---
@@ -122,11 +252,6 @@ def update_attendance(attendance_id):
     try:
         data = AttendanceSchema(**request.json)
 
-        # Verify candidate exists
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid Candidate ID"}), 400
-
         record.candidate_id = data.candidate_id
         record.session_name = data.session_name
         record.attended = data.attended
@@ -138,6 +263,11 @@ def update_attendance(attendance_id):
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid Candidate ID"}), 400
+        return jsonify({"error": str(e)}), 500
 
 
 # --- DELETE ALL ---
@@ -3,14 +3,25 @@ from pydantic import BaseModel, conint, confloat, ValidationError
 from typing import Optional, Annotated
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.exc import SQLAlchemyError
+import uuid
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.database import db
 from app.models.business import Business
-from app.models.candidates import Candidate
+from app.helpers.pagination import apply_filters, paginate
+from app.helpers.batch import create_batch, load_targets, apply_bulk_update
+from app.helpers.utils import is_foreign_key_violation
+from app.helpers.export import export_response
+from app.helpers.versioning import versioned
 
 business_bp = Blueprint("business_bp", __name__, url_prefix="/api/v1/business")
 
+# Columns returned by the list endpoint, fetched as plain tuples
+LIST_COLUMNS = (
+    Business.id, Business.candidate_id, Business.customers_before, Business.customers_after,
+    Business.income_before, Business.income_after, Business.created_at,
+)
+
 
 # -------------------------
 # Pydantic Validation Model
@@ -31,12 +42,10 @@ def create_business():
     try:
         data = BusinessSchema(**request.json)
 
-        # Validate candidate existence
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid candidate_id"}), 400
-
+        # The candidate_id foreign key validates the candidate on INSERT
+        new_id = uuid.uuid4()
         new_record = Business(
+            id=new_id,
             candidate_id=data.candidate_id,
             customers_before=data.customers_before,
             customers_after=data.customers_after,
@@ -47,43 +56,80 @@ def create_business():
         db.session.add(new_record)
         db.session.commit()
 
-        return jsonify({"message": "Business record created", "id": str(new_record.id)}), 201
+        return jsonify({"message": "Business record created", "id": str(new_id)}), 201
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid candidate_id"}), 400
+        return jsonify({"error": str(e)}), 500
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def build_business_row(data):
+    """Column values for one validated BusinessSchema (create-batch and imports)"""
+    return {
+        "candidate_id": data.candidate_id,
+        "customers_before": data.customers_before,
+        "customers_after": data.customers_after,
+        "income_before": data.income_before,
+        "income_after": data.income_after,
+    }
+
+
+# -------------------------
+# POST: Create many Business entries in one transaction
+# -------------------------
+@business_bp.route("/create-batch", methods=["POST"])
+def create_business_batch():
+    try:
+        body, status = create_batch(Business, BusinessSchema, build_business_row, request.json)
+        return jsonify(body), status
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
 # -------------------------
-# GET: All Business records
+# GET: Business records (keyset paginated)
+# Query params: limit, cursor, order, candidate_id, status, gender, district, date_from, date_to
 # -------------------------
 @business_bp.route("", methods=["GET"])
+@versioned("business", "candidates")
 def get_all_business():
     try:
-        records = Business.query.order_by(Business.created_at.desc()).all()
-        payload = [
-            {
-                "id": str(r.id),
-                "candidate_id": str(r.candidate_id),
-                "customers_before": r.customers_before,
-                "customers_after": r.customers_after,
-                "income_before": r.income_before,
-                "income_after": r.income_after,
-                "created_at": r.created_at.isoformat()
-            }
-            for r in records
-        ]
-        return jsonify(payload), 200
+        query = apply_filters(db.session.query(*LIST_COLUMNS), Business, request.args)
+        rows, next_cursor = paginate(query, Business, request.args)
+        # The JSON provider serializes UUIDs and datetimes as fetched
+        return jsonify({"items": [row._asdict() for row in rows], "next_cursor": next_cursor}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
 
+# -------------------------
+# GET: Stream Business records as NDJSON or CSV
+# Query params: format (ndjson | csv), include_candidate, plus the get-all filters
+# -------------------------
+@business_bp.route("/export", methods=["GET"])
+@versioned("business", "candidates")
+def export_business():
+    try:
+        return export_response(Business, request.args, "business")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
 # -------------------------
 # GET BY ID
 # -------------------------
 @business_bp.route("/<uuid:business_id>", methods=["GET"])
+@versioned("business")
 def get_business_by_id(business_id):
     record = Business.query.get(business_id)
     if not record:
@@ -110,20 +156,12 @@ def bulk_update_business():
     if not isinstance(payload, list):
         return jsonify({"error": "Expected a list of business objects"}), 400
 
-    updated = 0
-    for item in payload:
+    # Accept either `id` (record id) or `candidate_id` to find the record
+    targets, errors = load_targets(Business, payload)
+    updates = {}
+    for index, record in targets.items():
+        item = payload[index]
         try:
-            # Accept either `id` (record id) or `candidate_id` to find the record
-            if "id" in item:
-                record = Business.query.get(item["id"])
-            elif "candidate_id" in item:
-                record = Business.query.filter_by(candidate_id=item["candidate_id"]).first()
-            else:
-                continue
-
-            if not record:
-                continue
-
             validated = BusinessSchema(**{
                 "candidate_id": record.candidate_id,
                 "customers_before": item.get("customers_before", record.customers_before),
@@ -131,26 +169,30 @@ def bulk_update_business():
                 "income_before": item.get("income_before", record.income_before),
                 "income_after": item.get("income_after", record.income_after),
             })
-
-            record.customers_before = validated.customers_before
-            record.customers_after = validated.customers_after
-            record.income_before = validated.income_before
-            record.income_after = validated.income_after
-
-            updated += 1
-
-        except ValidationError:
-            continue
-        except Exception:
+        except ValidationError as e:
+            errors[index] = e.errors()
             continue
 
+        updates[index] = {
+            "id": record.id,
+            "customers_before": validated.customers_before,
+            "customers_after": validated.customers_after,
+            "income_before": validated.income_before,
+            "income_after": validated.income_after,
+        }
+
     try:
-        db.session.commit()
+        updated, results = apply_bulk_update(Business, payload, updates, errors)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
-    return jsonify({"message": f"{updated} records updated"}), 200
+    return jsonify({
+        "message": f"{updated} records updated",
+        "updated": updated,
+        "failed": len(payload) - updated,
+        "results": results,
+    }), 200
 
 
 # -------------------------
@@ -165,11 +207,6 @@ def update_business(business_id):
     try:
         data = BusinessSchema(**request.json)
 
-        # Ensure candidate exists
-        candidate = Candidate.query.get(data.candidate_id)
-        if not candidate:
-            return jsonify({"error": "Invalid candidate_id"}), 400
-
         record.candidate_id = data.candidate_id
         record.customers_before = data.customers_before
         record.customers_after = data.customers_after
@@ -181,6 +218,11 @@ def update_business(business_id):
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({"error": "Invalid candidate_id"}), 400
+        return jsonify({"error": str(e)}), 500
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -1,15 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from pydantic import BaseModel, ValidationError
 from typing import Optional, List
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 
 from app.database import db
 from ..models.candidates import Candidate
-from app.helpers.utils import get_location_by_pincode
+from app.helpers.utils import get_location_by_pincode, get_locations_by_pincodes, violated_constraint
+from app.helpers.pagination import apply_filters, paginate
+from app.helpers.batch import apply_bulk_update
+from app.helpers.export import export_response
+from app.helpers.versioning import versioned
+from app.helpers.search import SEARCH_FIELDS, get_search_limit, search_candidates, search_candidates_batch
 
 candidate_bp = Blueprint('candidate_bp', __name__, url_prefix='/api/v1/candidates')
 
+# Unique index behind "Contact already registered"; other integrity errors are reported as is
+CONTACT_INDEX = "ux_candidates_contact"
+
+# Columns returned by the list endpoint, fetched as plain tuples
+LIST_COLUMNS = (
+    Candidate.id, Candidate.name, Candidate.contact, Candidate.gender, Candidate.business_type,
+    Candidate.state, Candidate.district, Candidate.taluk, Candidate.pin_code,
+    Candidate.udyam_certificate, Candidate.phone_type, Candidate.disability_cat,
+    Candidate.status, Candidate.created_at,
+)
+
+# Child record fields included by the /full endpoints
+ATTENDANCE_FIELDS = ("id", "session_name", "attended", "date", "remarks", "created_at")
+ASSESSMENT_FIELDS = ("id", "training", "date", "status", "mark", "remarks", "created_at")
+BUSINESS_FIELDS = ("id", "customers_before", "customers_after", "income_before", "income_after", "created_at")
+
+# One IN query per child table for the whole page of candidates
+FULL_LOAD_OPTIONS = (
+    selectinload(Candidate.attendance),
+    selectinload(Candidate.assessments),
+    selectinload(Candidate.business),
+)
+
 
 # --- Pydantic Schema for Validation ---
 class CandidateSchema(BaseModel):
@@ -28,6 +57,18 @@ class CandidateUpdateSchema(CandidateSchema):
     status: Optional[str] = None  # Only editable here
 
 
+# Schemas for batch name resolution
+class CandidateSearchQuery(BaseModel):
+    name: str
+    district: Optional[str] = None
+    taluk: Optional[str] = None
+
+
+class CandidateSearchBatchSchema(BaseModel):
+    queries: List[CandidateSearchQuery]
+    limit: Optional[int] = 1
+
+
 # --- POST: Create New Candidate ---
 @candidate_bp.route('/create', methods=['POST'])
 def create_candidate():
@@ -61,37 +102,89 @@ def create_candidate():
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if violated_constraint(e) == CONTACT_INDEX:
+            return jsonify({"error": "Contact already registered"}), 400
+        return jsonify({"error": str(e)}), 500
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
-# --- GET: Fetch All Candidates ---
+# --- GET: Fetch Candidates (keyset paginated) ---
+# Query params: limit, cursor, order, status, gender, district, date_from, date_to
 @candidate_bp.route('/get-all', methods=['GET'])
+@versioned('candidates')
 def get_all_candidates():
-    candidates = Candidate.query.all()
-    return jsonify([
-        {
-            "id": str(c.id),
-            "name": c.name,
-            "contact": c.contact,
-            "gender": c.gender,
-            "business_type": c.business_type,
-            "state": c.state,
-            "district": c.district,
-            "taluk": c.taluk,
-            "pin_code": c.pin_code,
-            "udyam_certificate": c.udyam_certificate,
-            "phone_type": c.phone_type,
-            "disability_cat": c.disability_cat,  # Added
-            "status": c.status
-        }
-        for c in candidates
-    ]), 200
+    try:
+        query = apply_filters(db.session.query(*LIST_COLUMNS), Candidate, request.args)
+        rows, next_cursor = paginate(query, Candidate, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # The JSON provider serializes UUIDs and datetimes as fetched
+    return jsonify({"items": [row._asdict() for row in rows], "next_cursor": next_cursor}), 200
+
+
+# --- GET: Stream all candidates as NDJSON or CSV ---
+# Query params: format (ndjson | csv), plus the get-all filters
+@candidate_bp.route('/export', methods=['GET'])
+@versioned('candidates')
+def export_candidates():
+    try:
+        return export_response(Candidate, request.args, "candidates")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+# --- GET: Fuzzy search by name and location ---
+# Query params: name, district, taluk (at least one), limit (default 10, max 50)
+@candidate_bp.route('/search', methods=['GET'])
+@versioned('candidates')
+def search():
+    try:
+        limit = get_search_limit(request.args.get("limit"))
+        items = search_candidates({field: request.args.get(field) for field in SEARCH_FIELDS}, limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({"items": items}), 200
+
+
+# --- POST: Resolve many names in one call (imports) ---
+# Body: {"queries": [{"name", "district"?, "taluk"?}, ...], "limit": 1}
+@candidate_bp.route('/search/batch', methods=['POST'])
+def search_batch():
+    try:
+        data = CandidateSearchBatchSchema(**request.json)
+        limit = get_search_limit(data.limit, default=1)
+    except ValidationError as e:
+        return jsonify({"validation_errors": e.errors()}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    max_rows = current_app.config.get("BATCH_MAX_ROWS", 10000)
+    if len(data.queries) > max_rows:
+        return jsonify({"error": f"At most {max_rows} queries per batch"}), 400
+
+    try:
+        matches = search_candidates_batch([q.model_dump() for q in data.queries], limit)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "results": [{"index": index, "matches": found} for index, found in enumerate(matches)]
+    }), 200
 
 
 # --- GET BY ID ---
 @candidate_bp.route('/get/<uuid:candidate_id>', methods=['GET'])
+@versioned('candidates')
 def get_candidate_by_id(candidate_id):
     candidate = Candidate.query.get(candidate_id)
     if not candidate:
@@ -114,6 +207,71 @@ def get_candidate_by_id(candidate_id):
     }), 200
 
 
+def _fields(obj, names):
+    return {name: getattr(obj, name) for name in names}
+
+
+def _delta(before, after):
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def candidate_full(candidate):
+    """A candidate with its child records and the dashboard figures derived from them"""
+    attendance, assessments, business = candidate.attendance, candidate.assessments, candidate.business
+
+    attended = sum(1 for a in attendance if a.attended)
+    latest_assessment = assessments[-1] if assessments else None
+    latest_business = business[-1] if business else None
+
+    return {
+        **{column.key: getattr(candidate, column.key) for column in LIST_COLUMNS},
+        "summary": {
+            "sessions_total": len(attendance),
+            "sessions_attended": attended,
+            "attendance_rate": round(attended / len(attendance), 4) if attendance else None,
+            "latest_assessment_mark": latest_assessment.mark if latest_assessment else None,
+            "latest_assessment_date": latest_assessment.date if latest_assessment else None,
+            "income_delta": _delta(latest_business.income_before, latest_business.income_after)
+            if latest_business else None,
+            "customers_delta": _delta(latest_business.customers_before, latest_business.customers_after)
+            if latest_business else None,
+        },
+        "attendance": [_fields(a, ATTENDANCE_FIELDS) for a in attendance],
+        "assessments": [_fields(a, ASSESSMENT_FIELDS) for a in assessments],
+        "business": [_fields(b, BUSINESS_FIELDS) for b in business],
+    }
+
+
+# --- GET: One candidate with attendance, assessments and business ---
+@candidate_bp.route('/<uuid:candidate_id>/full', methods=['GET'])
+@versioned('candidates', 'attendance', 'assessment', 'business')
+def get_candidate_full(candidate_id):
+    candidate = Candidate.query.options(*FULL_LOAD_OPTIONS).filter(Candidate.id == candidate_id).first()
+    if not candidate:
+        return jsonify({"error": "Candidate not found"}), 404
+
+    return jsonify(candidate_full(candidate)), 200
+
+
+# --- GET: Candidates with their child records (keyset paginated) ---
+# Query params: same as /get-all
+@candidate_bp.route('/full', methods=['GET'])
+@versioned('candidates', 'attendance', 'assessment', 'business')
+def get_candidates_full():
+    try:
+        query = apply_filters(Candidate.query.options(*FULL_LOAD_OPTIONS), Candidate, request.args)
+        candidates, next_cursor = paginate(query, Candidate, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "items": [candidate_full(candidate) for candidate in candidates],
+        "next_cursor": next_cursor,
+    }), 200
+
+
 # --- PUT: Bulk Update (no status change) ---
 @candidate_bp.route('/update-all', methods=['PUT'])
 def update_candidates():
@@ -121,30 +279,57 @@ def update_candidates():
     if not isinstance(data, list):
         return jsonify({"error": "Expected list of objects"}), 400
 
-    updated = 0
-    for item in data:
+    errors, validated = {}, {}
+    for index, item in enumerate(data):
         try:
-            validated = CandidateSchema(**item)
-            candidate = Candidate.query.filter_by(contact=validated.contact).first()
-            if candidate:
-                location = get_location_by_pincode(validated.pin_code)
-                if location:
-                    candidate.name = validated.name
-                    candidate.gender = validated.gender
-                    candidate.business_type = validated.business_type
-                    candidate.udyam_certificate = validated.udyam_certificate
-                    candidate.phone_type = validated.phone_type
-                    candidate.disability_cat = validated.disability_cat  # Added
-                    candidate.pin_code = validated.pin_code
-                    candidate.state = location["state"]
-                    candidate.district = location["district"]
-                    candidate.taluk = location["city"]
-                    updated += 1
-        except:
-            continue
+            validated[index] = CandidateSchema(**item)
+        except ValidationError as e:
+            errors[index] = e.errors()
+        except TypeError:
+            errors[index] = "Expected an object"
+
+    # One query for the targets and one batch pincode lookup for the locations
+    contacts = {v.contact for v in validated.values()}
+    ids_by_contact = dict(
+        db.session.query(Candidate.contact, Candidate.id).filter(Candidate.contact.in_(contacts)).all()
+    ) if contacts else {}
+    locations = get_locations_by_pincodes(v.pin_code for v in validated.values())
+
+    updates = {}
+    for index, v in validated.items():
+        candidate_id = ids_by_contact.get(v.contact)
+        location = locations.get(v.pin_code.strip())
+        if candidate_id is None:
+            errors[index] = "Candidate not found"
+        elif not location:
+            errors[index] = "Invalid Pincode"
+        else:
+            updates[index] = {
+                "id": candidate_id,
+                "name": v.name,
+                "gender": v.gender,
+                "business_type": v.business_type,
+                "udyam_certificate": v.udyam_certificate,
+                "phone_type": v.phone_type,
+                "disability_cat": v.disability_cat,
+                "pin_code": v.pin_code,
+                "state": location["state"],
+                "district": location["district"],
+                "taluk": location["city"],
+            }
 
-    db.session.commit()
-    return jsonify({"message": f"{updated} candidates updated"}), 200
+    try:
+        updated, results = apply_bulk_update(Candidate, data, updates, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "message": f"{updated} candidates updated",
+        "updated": updated,
+        "failed": len(data) - updated,
+        "results": results,
+    }), 200
 
 
 # --- PUT by ID (can update status here) ---
@@ -179,6 +364,14 @@ def update_candidate_by_id(candidate_id):
 
     except ValidationError as e:
         return jsonify({"validation_errors": e.errors()}), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        if violated_constraint(e) == CONTACT_INDEX:
+            return jsonify({"error": "Contact already registered"}), 400
+        return jsonify({"error": str(e)}), 500
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
 
 # --- DELETE ALL (soft delete optional) ---
@@ -0,0 +1,92 @@
+from flask import Blueprint, request, jsonify, current_app, url_for
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.database import db
+from app.models.import_job import ImportJob
+from app.helpers.ingest import IMPORT_KINDS, fail_orphaned_jobs, start_import
+
+imports_bp = Blueprint("imports_bp", __name__, url_prefix="/api/v1/imports")
+
+RECENT_JOBS = 50
+
+
+def job_to_dict(job, with_errors=True):
+    data = {
+        "id": str(job.id),
+        "kind": job.kind,
+        "filename": job.filename,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "inserted": job.inserted,
+        "failed": job.failed,
+        "progress": round(job.processed_rows / job.total_rows, 3) if job.total_rows else None,
+        "message": job.message,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if with_errors:
+        data["errors"] = job.errors
+    return data
+
+
+# -------------------------
+# POST: Upload a sheet and queue an import
+# -------------------------
+@imports_bp.route("/<kind>", methods=["POST"])
+def create_import(kind):
+    if kind not in IMPORT_KINDS:
+        return jsonify({"error": f"kind must be one of: {', '.join(IMPORT_KINDS)}"}), 404
+
+    # Checked before request.files, which reads and spools the whole body
+    max_mb = current_app.config.get("IMPORT_MAX_UPLOAD_MB", 50)
+    too_large = jsonify({"error": f"Uploads are limited to {max_mb} MB"}), 413
+    if request.content_length and request.content_length > max_mb * 1024 * 1024:
+        return too_large
+    # Bodies without a Content-Length (chunked) stop being read at the limit
+    request.max_content_length = max_mb * 1024 * 1024
+
+    try:
+        upload = request.files.get("file")
+    except RequestEntityTooLarge:
+        return too_large
+    if upload is None or not upload.filename:
+        return jsonify({"error": "Attach the spreadsheet as the 'file' field"}), 400
+    if not upload.filename.lower().endswith(".xlsx"):
+        return jsonify({"error": "Only .xlsx files are supported"}), 400
+
+    try:
+        job = start_import(kind, upload)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "job_id": str(job.id),
+        "status": job.status,
+        "status_url": url_for("imports_bp.get_import", job_id=job.id),
+    }), 202
+
+
+# -------------------------
+# GET: Job progress and row errors
+# -------------------------
+@imports_bp.route("/<uuid:job_id>", methods=["GET"])
+def get_import(job_id):
+    fail_orphaned_jobs()
+    job = db.session.get(ImportJob, job_id)
+    if not job:
+        return jsonify({"error": "Import job not found"}), 404
+    return jsonify(job_to_dict(job)), 200
+
+
+# -------------------------
+# GET: Recent jobs
+# -------------------------
+@imports_bp.route("", methods=["GET"])
+def list_imports():
+    fail_orphaned_jobs()
+    jobs = ImportJob.query.order_by(ImportJob.created_at.desc()).limit(RECENT_JOBS).all()
+    return jsonify([job_to_dict(job, with_errors=False) for job in jobs]), 200
@@ -0,0 +1,583 @@
+import time
+import queue
+from datetime import date, timedelta
+
+from flask import Blueprint, Response, jsonify, current_app, request
+from sqlalchemy import DateTime, and_, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.models.candidates import Candidate
+from app.models.business import Business
+from app.models.attendance import Attendance
+from app.models.assessment import Assessment
+from app.models.candidate_count import CandidateCount
+from app.models.attendance_daily import AttendanceDaily
+from app.helpers.live import LiveAggregates, StreamFull
+from app.helpers.pagination import apply_filters, parse_date
+from app.helpers.summaries import candidate_counts
+from app.helpers.versioning import cached_for_versions, versioned
+
+stats_bp = Blueprint("stats_bp", __name__, url_prefix="/api/v1/stats")
+
+CANDIDATE_BREAKDOWNS = ("status", "gender", "phone_type", "udyam_certificate", "disability_cat")
+
+BUSINESS_METRICS = ("income_before", "income_after", "customers_before", "customers_after")
+BUSINESS_GROUPS = {
+    "state": Candidate.state,
+    "district": Candidate.district,
+    "gender": Candidate.gender,
+    "udyam_certificate": Candidate.udyam_certificate,
+}
+PERCENTILES = (("p25", 0.25), ("median", 0.5), ("p75", 0.75), ("p90", 0.9))
+
+
+def _label(value):
+    """Booleans become "true"/"false" so they can be used as JSON keys"""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return value
+
+
+def compute_candidate_stats():
+    """Every breakdown from one GROUP BY over the candidate_counts summary"""
+    columns = [getattr(CandidateCount, name) for name in CANDIDATE_BREAKDOWNS]
+    rows = candidate_counts(*columns).all()
+
+    result = {"total": 0}
+    result.update({name: {} for name in CANDIDATE_BREAKDOWNS})
+    for row in rows:
+        count = row[-1]
+        result["total"] += count
+        for name, value in zip(CANDIDATE_BREAKDOWNS, row):
+            bucket = result[name]
+            key = _label(value)
+            bucket[key] = bucket.get(key, 0) + count
+    return result
+
+
+# --- GET: Candidate counts for the dashboard cards ---
+@stats_bp.route("/candidates", methods=["GET"])
+@versioned("candidates")
+def get_candidate_stats():
+    try:
+        stats = cached_for_versions(
+            "stats:candidates",
+            ("candidates",),
+            current_app.config.get("STATS_CACHE_TTL", 5),
+            compute_candidate_stats,
+        )
+        return jsonify(stats), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def _number(value):
+    return float(value) if value is not None else None
+
+
+def compute_business_stats(group_by=None):
+    """
+    Per-metric count/sum/avg/min/max and percentiles, computed in SQL.
+    NULLs are ignored by every aggregate, so count is the number of
+    records that actually report the metric.
+    """
+    columns = [func.count(Business.id)]
+    for name in BUSINESS_METRICS:
+        metric = getattr(Business, name)
+        columns += [func.count(metric), func.sum(metric), func.avg(metric), func.min(metric), func.max(metric)]
+        columns += [func.percentile_cont(q).within_group(metric) for _, q in PERCENTILES]
+
+    query = db.session.query(*columns)
+    if group_by:
+        group_column = BUSINESS_GROUPS[group_by]
+        query = (
+            db.session.query(group_column, *columns)
+            .join(Candidate, Candidate.id == Business.candidate_id)
+            .group_by(group_column)
+            .order_by(group_column)
+        )
+
+    groups = []
+    for row in query.all():
+        row = list(row)
+        entry = {"group": _label(row.pop(0))} if group_by else {}
+        entry["records"] = row.pop(0)
+        for name in BUSINESS_METRICS:
+            count, total, avg, low, high = row[:5]
+            quantiles = row[5:5 + len(PERCENTILES)]
+            del row[:5 + len(PERCENTILES)]
+            entry[name] = {
+                "count": count,
+                "sum": _number(total),
+                "avg": _number(avg),
+                "min": _number(low),
+                "max": _number(high),
+            }
+            entry[name].update({label: _number(v) for (label, _), v in zip(PERCENTILES, quantiles)})
+        groups.append(entry)
+
+    return {"group_by": group_by, "groups": groups}
+
+
+# --- GET: Business KPIs, optionally grouped by a candidate attribute ---
+# Query params: group_by = state | district | gender | udyam_certificate
+@stats_bp.route("/business", methods=["GET"])
+@versioned("business", "candidates")
+def get_business_stats():
+    group_by = request.args.get("group_by") or None
+    if group_by and group_by not in BUSINESS_GROUPS:
+        return jsonify({"error": f"group_by must be one of {', '.join(BUSINESS_GROUPS)}"}), 400
+
+    try:
+        stats = cached_for_versions(
+            f"stats:business:{group_by}",
+            ("business", "candidates"),
+            current_app.config.get("STATS_CACHE_TTL", 5),
+            lambda: compute_business_stats(group_by),
+        )
+        return jsonify(stats), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def compute_attendance_stats():
+    """Record count, attended count and rate, and distinct candidates in one scan"""
+    total, attended, candidates = db.session.query(
+        func.count(Attendance.id),
+        func.count(Attendance.id).filter(Attendance.attended.is_(True)),
+        func.count(func.distinct(Attendance.candidate_id)),
+    ).one()
+    return {
+        "total": total,
+        "attended": attended,
+        "attendance_rate": round(attended / total, 4) if total else None,
+        "candidates": candidates,
+    }
+
+
+# --- GET: Attendance totals for the dashboard ---
+@stats_bp.route("/attendance", methods=["GET"])
+@versioned("attendance")
+def get_attendance_stats():
+    try:
+        stats = cached_for_versions(
+            "stats:attendance",
+            ("attendance",),
+            current_app.config.get("STATS_CACHE_TTL", 5),
+            compute_attendance_stats,
+        )
+        return jsonify(stats), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+# Aggregates pushed by /stream: {name: (tables it depends on, compute)}
+live_stats = LiveAggregates({
+    "candidates": ({"candidates"}, compute_candidate_stats),
+    "attendance": ({"attendance"}, compute_attendance_stats),
+    "business": ({"business"}, compute_business_stats),
+})
+
+
+# --- GET: Server-sent events with the dashboard aggregates ---
+# Sends the current aggregates on connect, then a new "stats" event after
+# each commit that touches their tables. Every stream shares one computation.
+@stats_bp.route("/stream", methods=["GET"])
+def stream_stats():
+    app = current_app._get_current_object()
+    try:
+        subscriber = live_stats.subscribe(app)
+    except StreamFull:
+        return jsonify({"error": "Too many open dashboard streams, poll /api/v1/stats instead"}), 503
+
+    try:
+        first = live_stats.snapshot()
+    except SQLAlchemyError as e:
+        live_stats.unsubscribe(subscriber)
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+    heartbeat = app.config.get("STATS_STREAM_HEARTBEAT", 15)
+    # Streams hold a worker thread, so they end periodically and the browser reconnects
+    lifetime = app.config.get("STATS_STREAM_MAX_SECONDS", 300)
+
+    def events():
+        try:
+            yield b"retry: 3000\n\n" + first
+            sent = first
+            deadline = time.monotonic() + lifetime
+            while time.monotonic() < deadline:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b": keep-alive\n\n"
+                    continue
+                if message != sent:  # e.g. the listener's first refresh found nothing new
+                    yield message
+                    sent = message
+        finally:
+            live_stats.unsubscribe(subscriber)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # let nginx pass events through unbuffered
+    return response
+
+
+def cached_analytics(key, tables, compute):
+    """Version-keyed like the dashboard views, but kept for the longer analytics TTL"""
+    return cached_for_versions(key, tables, current_app.config.get("ANALYTICS_CACHE_TTL", 300), compute)
+
+
+# Columns identifying a group at each level of the region hierarchy
+REGION_LEVELS = {
+    "state": ("state",),
+    "district": ("state", "district"),
+    "taluk": ("state", "district", "taluk"),
+}
+REGION_FILTERS = ("state", "district", "taluk")
+REGION_TABLES = ("candidates", "attendance", "assessment", "business")
+
+
+def _ratio(part, whole):
+    return round(float(part) / whole, 4) if whole else None
+
+
+def compute_region_stats(level, filters):
+    """
+    One statement: candidate counts from the candidate_counts summary, plus
+    attendance, assessment and business aggregates each grouped by region
+    before joining, so child rows are never multiplied by each other.
+    """
+    keys = REGION_LEVELS[level]
+
+    def grouped(model, *aggregates):
+        region = [getattr(Candidate, k) for k in keys]
+        return (
+            select(*region, *aggregates)
+            .join(Candidate, Candidate.id == model.candidate_id)
+            .where(*(getattr(Candidate, k) == v for k, v in filters.items()))
+            .group_by(*region)
+            .subquery()
+        )
+
+    counts = (
+        select(
+            *(getattr(CandidateCount, k) for k in keys),
+            func.sum(CandidateCount.count).label("candidates"),
+            func.sum(CandidateCount.count).filter(CandidateCount.status == "Active").label("active"),
+        )
+        .where(*(getattr(CandidateCount, k) == v for k, v in filters.items()))
+        .group_by(*(getattr(CandidateCount, k) for k in keys))
+        .subquery()
+    )
+    attendance = grouped(
+        Attendance,
+        func.count(Attendance.id).label("records"),
+        func.count(Attendance.id).filter(Attendance.attended.is_(True)).label("attended"),
+    )
+    assessment = grouped(
+        Assessment,
+        func.count(Assessment.mark).label("marks"),
+        func.avg(Assessment.mark).label("mean_mark"),
+    )
+    uplift = Business.income_after - Business.income_before
+    business = grouped(
+        Business,
+        func.count(uplift).label("records"),
+        func.avg(uplift).label("mean_uplift"),
+    )
+
+    def on(sub):
+        return and_(*(sub.c[k] == counts.c[k] for k in keys))
+
+    query = (
+        select(
+            *(counts.c[k] for k in keys),
+            counts.c.candidates, counts.c.active,
+            attendance.c.records, attendance.c.attended,
+            assessment.c.marks, assessment.c.mean_mark,
+            business.c.records.label("business_records"), business.c.mean_uplift,
+        )
+        .select_from(counts)
+        .outerjoin(attendance, on(attendance))
+        .outerjoin(assessment, on(assessment))
+        .outerjoin(business, on(business))
+        .where(counts.c.candidates > 0)
+        .order_by(*(counts.c[k] for k in keys))
+    )
+
+    groups = []
+    for row in db.session.execute(query):
+        candidates, active = int(row.candidates), int(row.active or 0)
+        groups.append({
+            **{k: getattr(row, k) for k in keys},
+            "candidates": candidates,
+            "active": active,
+            "active_ratio": _ratio(active, candidates),
+            "attendance_records": row.records or 0,
+            "attendance_rate": _ratio(row.attended or 0, row.records),
+            "assessments": row.marks or 0,
+            "mean_mark": round(float(row.mean_mark), 2) if row.mean_mark is not None else None,
+            "business_records": row.business_records or 0,
+            "mean_income_uplift": round(row.mean_uplift, 2) if row.mean_uplift is not None else None,
+        })
+    return {"level": level, "filters": filters, "groups": groups}
+
+
+# --- GET: Region drill-down ---
+# Query params: level = state | district | taluk, optional state / district / taluk filters,
+# e.g. ?level=taluk&state=Karnataka&district=Bangalore
+@stats_bp.route("/regions", methods=["GET"])
+@versioned(*REGION_TABLES)
+def get_region_stats():
+    level = request.args.get("level", "state")
+    if level not in REGION_LEVELS:
+        return jsonify({"error": f"level must be one of {', '.join(REGION_LEVELS)}"}), 400
+    filters = {k: request.args[k].strip() for k in REGION_FILTERS if request.args.get(k, "").strip()}
+
+    try:
+        key = "stats:regions:" + level + ":" + "|".join(f"{k}={v}" for k, v in sorted(filters.items()))
+        stats = cached_analytics(key, REGION_TABLES, lambda: compute_region_stats(level, filters))
+        return jsonify(stats), 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+SERIES_BUCKETS = ("day", "week", "month")
+SERIES_FILTERS = ("session", "district", "candidate_id")
+SERIES_TABLES = ("attendance", "candidates")
+SERIES_MAX_BUCKETS = 1000
+SERIES_DEFAULT_DAYS = 365
+
+
+def _bucket_starts(bucket, date_from, date_to):
+    """Every bucket start from date_from's bucket to date_to, as date_trunc labels them"""
+    if bucket == "week":
+        start = date_from - timedelta(days=date_from.weekday())  # ISO weeks start on Monday
+    elif bucket == "month":
+        start = date_from.replace(day=1)
+    else:
+        start = date_from
+
+    starts = []
+    while start <= date_to:
+        if len(starts) >= SERIES_MAX_BUCKETS:
+            raise ValueError(f"Range spans more than {SERIES_MAX_BUCKETS} {bucket} buckets")
+        starts.append(start)
+        if bucket == "month":
+            start = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            start += timedelta(days=7 if bucket == "week" else 1)
+    return starts
+
+
+def compute_attendance_series(bucket, date_from, date_to, filters):
+    """
+    Attendance rate per day, week or month. Daily counts are rolled up with
+    date_trunc. Unfiltered and session series read the attendance_daily
+    summary, one row per day and session. District and candidate filters
+    count attendance rows through the date and candidate_id indexes.
+    """
+    starts = _bucket_starts(bucket, date_from, date_to)
+
+    if "district" in filters or "candidate_id" in filters:
+        daily = apply_filters(
+            select(
+                Attendance.date,
+                func.count().label("records"),
+                func.count().filter(Attendance.attended.is_(True)).label("attended"),
+            ),
+            Attendance,
+            {**filters, "date_from": date_from.isoformat(), "date_to": date_to.isoformat()},
+        ).group_by(Attendance.date)
+    else:
+        daily = select(AttendanceDaily.date, AttendanceDaily.records, AttendanceDaily.attended).where(
+            AttendanceDaily.session == filters.get("session", ""),
+            AttendanceDaily.date.between(date_from, date_to),
+        )
+    daily = daily.subquery()
+    # Truncating a timestamp, not a date, keeps the result independent of the session time zone
+    start = func.date_trunc(bucket, cast(daily.c.date, DateTime)).label("start")
+    query = select(start, func.sum(daily.c.records), func.sum(daily.c.attended)).group_by(start)
+    counts = {row[0].date(): (int(row[1]), int(row[2])) for row in db.session.execute(query)}
+
+    series = []
+    for day in starts:
+        records, attended = counts.get(day, (0, 0))
+        series.append({
+            "start": day.isoformat(),
+            "records": records,
+            "attended": attended,
+            "attendance_rate": _ratio(attended, records),
+        })
+    records = sum(entry["records"] for entry in series)
+    attended = sum(entry["attended"] for entry in series)
+    return {
+        "bucket": bucket,
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "filters": filters,
+        "records": records,
+        "attended": attended,
+        "attendance_rate": _ratio(attended, records),
+        "series": series,
+    }
+
+
+# --- GET: Attendance rate over time ---
+# Query params: bucket = day | week (default) | month, date_from, date_to
+# (default: the 365 days up to today), and optional session / district / candidate_id
+@stats_bp.route("/attendance/series", methods=["GET"])
+@versioned(*SERIES_TABLES)
+def get_attendance_series():
+    args = request.args
+    bucket = args.get("bucket", "week")
+    if bucket not in SERIES_BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(SERIES_BUCKETS)}"}), 400
+    filters = {k: args[k].strip() for k in SERIES_FILTERS if args.get(k, "").strip()}
+
+    try:
+        date_to = parse_date(args["date_to"], "date_to") if args.get("date_to") else date.today()
+        date_from = (
+            parse_date(args["date_from"], "date_from") if args.get("date_from")
+            else date_to - timedelta(days=SERIES_DEFAULT_DAYS - 1)
+        )
+        if date_from > date_to:
+            raise ValueError("date_from must not be after date_to")
+        key = f"stats:attendance-series:{bucket}:{date_from}:{date_to}:" + "|".join(
+            f"{k}={v}" for k, v in sorted(filters.items())
+        )
+        stats = cached_analytics(
+            key, SERIES_TABLES, lambda: compute_attendance_series(bucket, date_from, date_to, filters),
+        )
+        return jsonify(stats), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+ASSESSMENT_FILTERS = ("district", "date_from", "date_to")
+ASSESSMENT_TABLES = ("assessment", "candidates")
+HISTOGRAM_MAX_BINS = 100
+
+
+def _int_arg(args, name, default):
+    try:
+        return int(args.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+def compute_assessment_stats(training, filters, bins, low, high):
+    """
+    Mark distribution per training: summary statistics and percentiles per
+    training, read in (training, mark) index order, joined to record counts
+    per (training, histogram bin, status) that fold into the histogram and
+    status counts. One statement, so both halves see the same snapshot.
+    Marks outside [low, high] are counted in the first or last bin.
+    """
+    def filtered(*columns):
+        query = apply_filters(select(*columns), Assessment, filters)
+        if training:
+            query = query.where(Assessment.training == training)
+        return query
+
+    mark = Assessment.mark
+    summary = filtered(
+        Assessment.training.label("training"),
+        func.count(),
+        func.count(mark),
+        func.avg(mark),
+        func.min(mark),
+        func.max(mark),
+        *(func.percentile_cont(q).within_group(mark) for _, q in PERCENTILES),
+    ).group_by(Assessment.training).subquery()
+    # width_bucket puts low..high into 1..bins, values below into 0 and from high on into bins + 1
+    bin_col = func.least(func.greatest(func.width_bucket(mark, low, high, bins), 1), bins)
+    counts = filtered(
+        Assessment.training.label("training"),
+        bin_col,
+        Assessment.status,
+        func.count(),
+        func.count(mark),
+    ).group_by(Assessment.training, bin_col, Assessment.status).subquery()
+    query = select(*summary.c, *list(counts.c)[1:]).join(counts, counts.c.training == summary.c.training)
+
+    width = (high - low) / bins
+    by_training = {}
+    for row in db.session.execute(query):
+        name, records, marks, average, lowest, highest = row[:6]
+        bin_number, status, bin_records, bin_marks = row[-4:]
+        entry = by_training.get(name)
+        if entry is None:
+            entry = by_training[name] = {
+                "training": name,
+                "records": records,
+                "count": marks,
+                "mean": round(float(average), 2) if average is not None else None,
+                "min": lowest,
+                "max": highest,
+                **{label: _number(v) for (label, _), v in zip(PERCENTILES, row[6:-4])},
+                "histogram": [
+                    {"from": round(low + i * width, 4), "to": round(low + (i + 1) * width, 4), "count": 0}
+                    for i in range(bins)
+                ],
+                "status": {},
+            }
+        # GREATEST skips NULLs, so records without a mark land in bin 1 but add no marks
+        entry["histogram"][bin_number - 1]["count"] += bin_marks
+        entry["status"][status] = entry["status"].get(status, 0) + bin_records
+
+    for entry in by_training.values():
+        entry["status"] = sorted(
+            ({"status": status, "count": n} for status, n in entry["status"].items()), key=lambda s: -s["count"],
+        )
+    return {
+        "filters": {**filters, **({"training": training} if training else {})},
+        "bins": bins,
+        "range": [low, high],
+        "trainings": sorted(by_training.values(), key=lambda e: e["training"]),
+    }
+
+
+# --- GET: Assessment mark distribution per training ---
+# Query params: training, district, date_from, date_to, and the histogram's
+# bins (default 10) over mark_min..mark_max (default 0..100)
+@stats_bp.route("/assessment", methods=["GET"])
+@versioned(*ASSESSMENT_TABLES)
+def get_assessment_stats():
+    args = request.args
+    training = args.get("training", "").strip() or None
+    filters = {k: args[k].strip() for k in ASSESSMENT_FILTERS if args.get(k, "").strip()}
+
+    try:
+        bins = _int_arg(args, "bins", 10)
+        low, high = _int_arg(args, "mark_min", 0), _int_arg(args, "mark_max", 100)
+        if not 1 <= bins <= HISTOGRAM_MAX_BINS:
+            raise ValueError(f"bins must be between 1 and {HISTOGRAM_MAX_BINS}")
+        if low >= high:
+            raise ValueError("mark_min must be less than mark_max")
+        for name in ("date_from", "date_to"):
+            if name in filters:
+                parse_date(filters[name], name)
+
+        key = f"stats:assessment:{training}:{bins}:{low}:{high}:" + "|".join(
+            f"{k}={v}" for k, v in sorted(filters.items())
+        )
+        stats = cached_analytics(
+            key, ASSESSMENT_TABLES, lambda: compute_assessment_stats(training, filters, bins, low, high),
+        )
+        return jsonify(stats), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
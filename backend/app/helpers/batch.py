@@ -0,0 +1,178 @@
+# app/helpers/batch.py
+import uuid
+
+from flask import current_app
+from pydantic import ValidationError
+from sqlalchemy import cast, column, insert, update, values
+
+from app.database import db
+from app.models.candidates import Candidate
+
+
+def existing_candidate_ids(candidate_ids):
+    """All of the given candidate ids that exist, in one query"""
+    if not candidate_ids:
+        return set()
+    rows = db.session.query(Candidate.id).filter(Candidate.id.in_(set(candidate_ids))).all()
+    return {row[0] for row in rows}
+
+
+def create_batch(model, schema, build_row, payload):
+    """
+    Validate a list of records, check every candidate_id with one query and
+    insert the valid rows with a single multi-row INSERT in one transaction.
+
+    build_row(validated) returns the column values for one record; it may
+    raise ValueError for bad field formats.
+    Returns (body, status) with a result entry for every input row.
+    """
+    if not isinstance(payload, list):
+        return {"error": "Expected a list of objects"}, 400
+
+    max_rows = current_app.config.get("BATCH_MAX_ROWS", 10000)
+    if len(payload) > max_rows:
+        return {"error": f"At most {max_rows} records per batch"}, 400
+
+    results = [None] * len(payload)
+    pending = []
+    for index, item in enumerate(payload):
+        try:
+            validated = schema(**item)
+            row = build_row(validated)
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "error", "validation_errors": e.errors()}
+            continue
+        except (TypeError, ValueError) as e:
+            results[index] = {"index": index, "status": "error", "error": str(e)}
+            continue
+        pending.append((index, row))
+
+    known = existing_candidate_ids([row["candidate_id"] for _, row in pending])
+
+    rows = []
+    for index, row in pending:
+        if row["candidate_id"] not in known:
+            results[index] = {"index": index, "status": "error", "error": "Invalid Candidate ID"}
+            continue
+        row["id"] = uuid.uuid4()
+        rows.append(row)
+        results[index] = {"index": index, "status": "created", "id": str(row["id"])}
+
+    if rows:
+        db.session.execute(insert(model), rows)
+        db.session.commit()
+
+    body = {
+        "inserted": len(rows),
+        "failed": len(payload) - len(rows),
+        "results": results,
+    }
+    return body, (201 if rows or not payload else 400)
+
+
+def _as_uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def load_targets(model, payload):
+    """
+    Find the record each bulk-update item refers to: by `id`, or else by
+    `candidate_id` (that candidate's earliest record). At most two queries.
+    Returns ({index: row}, {index: error message}).
+    """
+    keys, errors = {}, {}
+    for index, item in enumerate(payload):
+        if not isinstance(item, dict):
+            errors[index] = "Expected an object"
+            continue
+        kind = "id" if item.get("id") else "candidate_id" if item.get("candidate_id") else None
+        if kind is None:
+            errors[index] = "id or candidate_id is required"
+            continue
+        value = _as_uuid(item[kind])
+        if value is None:
+            errors[index] = f"Invalid {kind}"
+            continue
+        keys[index] = (kind, value)
+
+    columns = list(model.__table__.c)
+    found = {"id": {}, "candidate_id": {}}
+
+    ids = {value for kind, value in keys.values() if kind == "id"}
+    if ids:
+        for row in db.session.query(*columns).filter(model.id.in_(ids)):
+            found["id"][row.id] = row
+
+    candidate_ids = {value for kind, value in keys.values() if kind == "candidate_id"}
+    if candidate_ids:
+        rows = (
+            db.session.query(*columns)
+            .filter(model.candidate_id.in_(candidate_ids))
+            .order_by(model.created_at, model.id)
+        )
+        for row in rows:
+            found["candidate_id"].setdefault(row.candidate_id, row)
+
+    targets = {}
+    for index, (kind, value) in keys.items():
+        row = found[kind].get(value)
+        if row is None:
+            errors[index] = "Record not found"
+        else:
+            targets[index] = row
+    return targets, errors
+
+
+def bulk_update(model, rows):
+    """
+    Write rows (dicts with "id" plus the columns to set, all with the same
+    keys) using a single UPDATE ... FROM (VALUES ...) statement.
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    names = list(rows[0])
+    data = values(*[column(name, table.c[name].type) for name in names], name="v").data(
+        [tuple(row[name] for name in names) for row in rows]
+    )
+    # VALUES params arrive untyped, so cast each one back to its column type
+    stmt = (
+        update(table)
+        .where(table.c.id == cast(data.c.id, table.c.id.type))
+        .values({name: cast(data.c[name], table.c[name].type) for name in names if name != "id"})
+    )
+    return db.session.execute(stmt).rowcount
+
+
+def apply_bulk_update(model, payload, updates, errors):
+    """
+    Run bulk_update for {index: row values} and build the per-item report.
+    errors maps the remaining indexes to a message or a list of validation
+    errors. When several items target the same record, the last one wins.
+    """
+    latest = {}
+    for index in sorted(updates):
+        record_id = updates[index]["id"]
+        if record_id in latest:
+            errors[latest[record_id]] = "Superseded by a later item for the same record"
+        latest[record_id] = index
+
+    rows = [updates[index] for index in latest.values()]
+    bulk_update(model, rows)
+    db.session.commit()
+
+    results = []
+    for index in range(len(payload)):
+        if index in errors:
+            error = errors[index]
+            key = "validation_errors" if isinstance(error, list) else "error"
+            results.append({"index": index, "status": "error", key: error})
+        else:
+            results.append({"index": index, "status": "updated", "id": str(updates[index]["id"])})
+    return len(rows), results
@@ -0,0 +1,83 @@
+# app/helpers/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small process-local cache for expensive read-only results.
+    Concurrent misses on the same key wait for a single computation.
+    Holds at most max_entries; expired entries are dropped on insert and the
+    least recently used go first when it is full. Keys can carry request
+    filters and table versions, so the set of keys is unbounded.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires, value), least recently used first
+        self._lock = threading.Lock()
+        self._key_locks = {}        # key -> [lock, threads using it]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key, ttl, value):
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, (expires, _) in self._data.items() if expires <= now]:
+                del self._data[stale]
+            self._data[key] = (now + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _acquire_key(self, key):
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+
+    def _release_key(self, key):
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._key_locks[key]  # nobody else waits on it
+
+    def get_or_compute(self, key, ttl, compute):
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        self._acquire_key(key)
+        try:
+            # Another thread may have filled it while we waited
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self._set(key, ttl, value)
+            return value
+        finally:
+            self._release_key(key)
+
+    def invalidate(self, prefix=""):
+        with self._lock:
+            for key in [k for k in self._data if str(k).startswith(prefix)]:
+                del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Sized from CACHE_MAX_ENTRIES by create_app
+cache = TTLCache()
@@ -0,0 +1,110 @@
+# app/helpers/export.py
+import csv
+import io
+import json
+from datetime import date, datetime
+from uuid import UUID
+
+from flask import Response, current_app, stream_with_context
+
+from app.database import db
+from app.models.candidates import Candidate
+from app.helpers.pagination import apply_filters
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Candidate fields that child-table exports can include with ?include_candidate=true
+CANDIDATE_EXPORT_COLUMNS = [
+    ("candidate_name", Candidate.name),
+    ("candidate_district", Candidate.district),
+]
+
+
+def _plain(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return _plain(value)
+
+
+def export_format(args):
+    fmt = args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def wants_candidate_columns(args):
+    return args.get("include_candidate", "false").lower() in ("1", "true", "yes")
+
+
+def stream_export(query, names, fmt, filename):
+    """
+    Stream the rows of a column query as NDJSON or CSV.
+    Rows are read through a server-side cursor (yield_per), so memory stays
+    flat regardless of table size.
+    """
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    rows = query.yield_per(batch_size)
+
+    def generate_ndjson():
+        buffer = []
+        for row in rows:
+            record = {name: _plain(value) for name, value in zip(names, row)}
+            buffer.append(json.dumps(record))
+            if len(buffer) >= batch_size:
+                yield "\n".join(buffer) + "\n"
+                buffer = []
+        if buffer:
+            yield "\n".join(buffer) + "\n"
+
+    def generate_csv():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(names)
+        for count, row in enumerate(rows, 1):
+            writer.writerow([_csv_value(value) for value in row])
+            if count % batch_size == 0:
+                yield out.getvalue()
+                out.seek(0)
+                out.truncate()
+        yield out.getvalue()
+
+    generate = generate_csv if fmt == "csv" else generate_ndjson
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"},
+    )
+
+
+def export_response(model, args, filename):
+    """
+    Export every column of model, filtered like the list endpoints and
+    ordered by (created_at, id). Raises ValueError on bad query params.
+    """
+    fmt = export_format(args)
+    columns = [(column.name, column) for column in model.__table__.c]
+    columns.sort(key=lambda item: item[0] != "id")  # id first, then table order
+
+    include_candidate = model is not Candidate and wants_candidate_columns(args)
+    if include_candidate:
+        columns += CANDIDATE_EXPORT_COLUMNS
+
+    query = db.session.query(*[column for _, column in columns]).select_from(model)
+    if include_candidate:
+        query = query.join(Candidate, Candidate.id == model.candidate_id)
+    query = apply_filters(query, model, args, candidate_joined=include_candidate)
+    query = query.order_by(model.created_at, model.id)
+
+    return stream_export(query, [name for name, _ in columns], fmt, filename)
@@ -0,0 +1,151 @@
+# app/helpers/indexes.py
+import json
+import sys
+import uuid
+from datetime import date, datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import literal_column, text, tuple_
+from sqlalchemy.schema import CreateIndex
+
+from app.database import db
+from app.models.candidates import Candidate
+from app.models.attendance import Attendance
+from app.models.assessment import Assessment
+from app.models.business import Business
+from app.models.table_version import TableVersion
+
+INDEXED_MODELS = (Candidate, Attendance, Assessment, Business)
+
+
+# Extensions the model indexes depend on (pg_trgm: trigram search indexes)
+EXTENSIONS = ("pg_trgm",)
+
+
+def create_extensions(conn):
+    for name in EXTENSIONS:
+        conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {name}"))
+
+
+@click.command("ensure-extensions")
+@with_appcontext
+def ensure_extensions_command():
+    """Create the Postgres extensions the schema needs. Run before `flask db upgrade`."""
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        create_extensions(conn)
+    click.echo(f"ok      {', '.join(EXTENSIONS)}")
+
+
+@click.command("ensure-indexes")
+@with_appcontext
+def ensure_indexes_command():
+    """
+    Bring an existing database up to the indexes declared on the models.
+    Safe to re-run; indexes are built CONCURRENTLY so tables stay writable.
+    """
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Index builds on large tables can outlast the request statement_timeout
+        conn.execute(text("SET statement_timeout = 0"))
+        create_extensions(conn)
+        TableVersion.__table__.create(conn, checkfirst=True)
+
+        # session_name moved from json to jsonb so it can carry a GIN index
+        column_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'attendance' AND column_name = 'session_name'"
+        )).scalar()
+        if column_type == "json":
+            conn.execute(text(
+                "ALTER TABLE attendance ALTER COLUMN session_name TYPE jsonb USING session_name::jsonb"
+            ))
+            click.echo("attendance.session_name converted to jsonb")
+        # Import jobs record the process that runs them (app/helpers/ingest.py)
+        conn.execute(text("ALTER TABLE IF EXISTS import_jobs ADD COLUMN IF NOT EXISTS owner integer"))
+
+        failed = False
+        for model in INDEXED_MODELS:
+            for index in sorted(model.__table__.indexes, key=lambda i: i.name):
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+                ddl = ddl.replace("INDEX ", "INDEX CONCURRENTLY ", 1)
+                try:
+                    conn.execute(text(ddl))
+                    click.echo(f"ok      {index.name}")
+                except Exception as e:
+                    # e.g. duplicate contacts block ux_candidates_contact
+                    failed = True
+                    click.echo(f"failed  {index.name}: {e.__cause__ or e}")
+        conn.execute(text("RESET statement_timeout"))
+
+    if failed:
+        sys.exit(1)
+
+
+def _hot_queries():
+    """The lookups the API runs on every request, with placeholder values"""
+    some_id, some_time = uuid.uuid4(), datetime(2025, 1, 1)
+    queries = {
+        "candidates by contact": Candidate.query.filter(Candidate.contact.in_(["9000000000"])),
+        "candidates name search": Candidate.query.filter(Candidate.name.op("%")("Ramesh Kumar")),
+        "candidates by district": Candidate.query.filter(
+            Candidate.state == "Karnataka", Candidate.district == "Bangalore"
+        ),
+        "candidates keyset page": Candidate.query.filter(
+            tuple_(Candidate.created_at, Candidate.id) < tuple_(some_time, some_id)
+        ).order_by(Candidate.created_at.desc(), Candidate.id.desc()).limit(100),
+        # JSONB values have no literal renderer, so spell the containment operand out
+        "attendance by session": Attendance.query.filter(
+            Attendance.session_name.contains(literal_column("""'["Digital Marketing"]'::jsonb"""))
+        ),
+        "attendance by date range": Attendance.query.filter(
+            Attendance.date >= date(2025, 1, 1), Attendance.date <= date(2025, 1, 31)
+        ),
+    }
+    for model in (Attendance, Assessment, Business):
+        name = model.__tablename__
+        queries[f"{name} by candidate"] = model.query.filter(model.candidate_id == some_id)
+        queries[f"{name} keyset page"] = model.query.filter(
+            tuple_(model.created_at, model.id) < tuple_(some_time, some_id)
+        ).order_by(model.created_at.desc(), model.id.desc()).limit(100)
+    queries["assessment by date range"] = Assessment.query.filter(
+        Assessment.date >= date(2025, 1, 1), Assessment.date <= date(2025, 1, 31)
+    )
+    queries["assessment by training"] = Assessment.query.filter(Assessment.training == "Digital Marketing")
+    return queries
+
+
+def _seq_scans(plan):
+    """Relations read with a sequential scan anywhere in an EXPLAIN JSON plan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+@click.command("check-query-plans")
+@with_appcontext
+def check_query_plans_command():
+    """
+    EXPLAIN every hot query with sequential scans disabled. If Postgres
+    still picks a Seq Scan, no index can serve the query and the check fails.
+    Works on an empty or seeded database alike.
+    """
+    failures = 0
+    db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    for name, query in _hot_queries().items():
+        sql = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+        rows = db.session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = (rows if isinstance(rows, list) else json.loads(rows))[0]["Plan"]
+        scans = _seq_scans(plan)
+        if scans:
+            failures += 1
+            click.echo(f"SEQ SCAN  {name} ({', '.join(scans)})")
+        else:
+            click.echo(f"ok        {name}")
+    db.session.rollback()
+
+    if failures:
+        click.echo(f"{failures} hot queries fall back to a sequential scan")
+        sys.exit(1)
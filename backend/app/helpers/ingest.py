@@ -0,0 +1,434 @@
+# app/helpers/ingest.py
+import logging
+import os
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import openpyxl
+import pandas as pd
+from flask import current_app
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import db
+from app.models.candidates import Candidate
+from app.models.attendance import Attendance
+from app.models.assessment import Assessment
+from app.models.business import Business
+from app.models.import_job import ImportJob
+from app.helpers.batch import create_batch
+from app.helpers.search import search_candidates_batch
+from app.helpers.utils import get_locations_by_pincodes, get_pincodes_by_places
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------- CELL VALUES ----------------
+def _header(value):
+    """'Business Type' -> 'business_type', matching the spreadsheet templates"""
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # numeric cells: contacts, pincodes
+    text = str(value).strip()
+    return text or None
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().upper() in ("TRUE", "YES", "1")
+
+
+class CellError(ValueError):
+    """A cell that cannot be read as its column's type; reported as that row's error"""
+
+
+def _int(value, column):
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise CellError(f"{column}: '{value}' is not a number")
+    if not number.is_integer():
+        raise CellError(f"{column}: '{value}' is not a whole number")
+    return int(number)
+
+
+def _float(value, column):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise CellError(f"{column}: '{value}' is not a number")
+
+
+def _date(value, column):
+    """Date cells arrive as datetimes; text cells are read day-first like the old scripts"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    try:
+        return pd.to_datetime(str(value), dayfirst=True).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise CellError(f"{column}: '{value}' is not a date")
+
+
+def _describe(error):
+    """One readable line for a batch result entry"""
+    if "validation_errors" in error:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error["validation_errors"]
+        )
+    return error.get("error", "Invalid row")
+
+
+# ---------------- CANDIDATE RESOLUTION ----------------
+def resolve_candidate_names(names):
+    """{lower-cased name: candidate id} for exact, case-insensitive matches"""
+    distinct = list(dict.fromkeys(n for n in names if n))
+    matches = search_candidates_batch([{"name": n} for n in distinct], limit=3)
+    resolved = {}
+    for name, found in zip(distinct, matches):
+        exact = next((m for m in found if m["name"].strip().lower() == name.lower()), None)
+        if exact:
+            resolved[name.lower()] = exact["id"]
+    return resolved
+
+
+# ---------------- ROW HANDLERS ----------------
+# Checked up front so one bad value cannot fail the whole chunk's INSERT
+CANDIDATE_ENUMS = {
+    field: Candidate.__table__.c[field].type.enums for field in ("gender", "phone_type")
+}
+
+# Each takes [(sheet row number, {header: value})] and returns (inserted, [error dicts])
+
+def _child_rows(model, schema, build_row, to_payload):
+    def handle(records):
+        ids = resolve_candidate_names(_text(values.get("name")) for _, values in records)
+
+        errors, payload, row_numbers = [], [], []
+        for row_number, values in records:
+            name = _text(values.get("name"))
+            candidate_id = ids.get(name.lower()) if name else None
+            if not candidate_id:
+                errors.append({"row": row_number, "error": f"Candidate '{name or ''}' not found"})
+                continue
+            try:
+                payload.append({"candidate_id": candidate_id, **to_payload(values)})
+            except CellError as e:
+                errors.append({"row": row_number, "error": str(e)})
+                continue
+            row_numbers.append(row_number)
+
+        if not payload:
+            return 0, errors
+        body, _ = create_batch(model, schema, build_row, payload)
+        for result in body["results"]:
+            if result["status"] == "error":
+                errors.append({"row": row_numbers[result["index"]], "error": _describe(result)})
+        return body["inserted"], errors
+    return handle
+
+
+def _place(values):
+    """(state, district, taluk) cells, as in the candidates_input.xlsx template"""
+    return tuple(_text(values.get(column)) or "" for column in ("state", "district", "taluk"))
+
+
+def _candidate_rows(records):
+    from app.api.candidate import CandidateSchema
+
+    # Sheets without a pincode column (the template) name the place instead;
+    # each distinct place in the chunk is resolved once from the offline index
+    places = {
+        row_number: _place(values) for row_number, values in records
+        if not _text(values.get("pin_code") or values.get("pincode")) and any(_place(values))
+    }
+    pincodes = get_pincodes_by_places(places.values()) if places else {}
+
+    errors, valid = [], []
+    for row_number, values in records:
+        place = places.get(row_number)
+        if place and not pincodes.get(place):
+            errors.append({"row": row_number, "error": f"Could not find pincode for {'/'.join(place)}"})
+            continue
+        pin_code = pincodes[place] if place else _text(values.get("pin_code") or values.get("pincode"))
+        try:
+            data = CandidateSchema(
+                name=_text(values.get("name")),
+                contact=_text(values.get("contact")),
+                gender=_text(values.get("gender")),
+                business_type=[
+                    v.strip() for v in (_text(values.get("business_type")) or "").split(",") if v.strip()
+                ],
+                pin_code=pin_code or "",
+                udyam_certificate=_bool(values.get("udyam_certificate")),
+                phone_type=_text(values.get("phone_type") or values.get("phone_model")),
+                disability_cat=_bool(values.get("disability_cat", values.get("disabled"))),
+            )
+        except ValidationError as e:
+            errors.append({"row": row_number, "error": _describe({"validation_errors": e.errors()})})
+            continue
+        valid.append((row_number, data))
+
+    # One pincode lookup for the whole chunk
+    locations = get_locations_by_pincodes(data.pin_code for _, data in valid)
+
+    rows, row_numbers, seen = [], {}, set()
+    for row_number, data in valid:
+        location = locations.get(data.pin_code.strip())
+        bad_enum = next((
+            f"{field} must be one of: {', '.join(choices)}"
+            for field, choices in CANDIDATE_ENUMS.items() if getattr(data, field) not in choices
+        ), None)
+        if bad_enum:
+            errors.append({"row": row_number, "error": bad_enum})
+            continue
+        if not location:
+            errors.append({"row": row_number, "error": "Invalid Pincode"})
+            continue
+        if data.contact in seen:
+            errors.append({"row": row_number, "error": "Contact already registered"})  # earlier in the file
+            continue
+        seen.add(data.contact)
+        row_numbers[data.contact] = row_number
+        rows.append({
+            "id": uuid.uuid4(),
+            "name": data.name,
+            "contact": data.contact,
+            "gender": data.gender,
+            "business_type": data.business_type,
+            "pin_code": data.pin_code,
+            "udyam_certificate": data.udyam_certificate,
+            "phone_type": data.phone_type,
+            "disability_cat": data.disability_cat,
+            "state": location["state"],
+            "district": location["district"],
+            "taluk": location["city"],
+            "status": "Active",
+        })
+
+    if not rows:
+        return 0, errors
+    # Contacts registered meanwhile by the API or another import are skipped, not fatal
+    inserted = set(db.session.scalars(
+        insert(Candidate).values(rows)
+        .on_conflict_do_nothing(index_elements=[Candidate.contact])
+        .returning(Candidate.contact)
+    ))
+    db.session.commit()
+    for contact, row_number in row_numbers.items():
+        if contact not in inserted:
+            errors.append({"row": row_number, "error": "Contact already registered"})
+    errors.sort(key=lambda e: e["row"])
+    return len(inserted), errors
+
+
+def _handlers():
+    from app.api.attendance import AttendanceSchema, build_attendance_row
+    from app.api.assessment import AssessmentSchema, build_assessment_row
+    from app.api.business import BusinessSchema, build_business_row
+
+    return {
+        "candidates": _candidate_rows,
+        # Column names follow the existing spreadsheet templates
+        "attendance": _child_rows(Attendance, AttendanceSchema, build_attendance_row, lambda v: {
+            "session_name": [_text(v.get("sessionname"))] if _text(v.get("sessionname")) else [],
+            "attended": _bool(v.get("attended")),
+            "date": _date(v.get("date"), "date"),
+            "remarks": _text(v.get("remarks")),
+        }),
+        "assessment": _child_rows(Assessment, AssessmentSchema, build_assessment_row, lambda v: {
+            "training": _text(v.get("training")),
+            "date": _date(v.get("date"), "date"),
+            "status": _text(v.get("status")),
+            "mark": _float(v.get("mark"), "mark"),
+            "remarks": _text(v.get("remarks")),
+        }),
+        "business": _child_rows(Business, BusinessSchema, build_business_row, lambda v: {
+            "customers_before": _int(v.get("totalcustomersbefore"), "totalcustomersbefore"),
+            "customers_after": _int(v.get("totalcustomersafter"), "totalcustomersafter"),
+            "income_before": _float(v.get("incomebefore"), "incomebefore"),
+            "income_after": _float(v.get("incomeafter"), "incomeafter"),
+        }),
+    }
+
+
+IMPORT_KINDS = ("candidates", "attendance", "assessment", "business")
+
+
+# ---------------- JOB RUNNER ----------------
+def _chunks(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def read_sheet(path):
+    """
+    Stream (row number, {header: value}) from the first sheet in read-only
+    mode, so memory does not grow with the file. Blank rows are skipped.
+    Returns (estimated data rows or None, iterator, workbook to close).
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    sheet = workbook.worksheets[0]
+    rows = sheet.iter_rows(values_only=True)
+    header = [_header(h) for h in next(rows, ())]
+    total = sheet.max_row - 1 if sheet.max_row else None
+
+    def records():
+        for row_number, values in enumerate(rows, start=2):
+            if any(v not in (None, "") for v in values):
+                yield row_number, dict(zip(header, values))
+    return total, records(), workbook
+
+
+def run_import(app, job_id, path):
+    """Parse the upload in chunks, insert each chunk in its own transaction and record progress"""
+    with app.app_context():
+        job = db.session.get(ImportJob, job_id)
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+
+        chunk_size = app.config.get("IMPORT_CHUNK_SIZE", 1000)
+        max_errors = app.config.get("IMPORT_MAX_ERRORS", 1000)
+        workbook = None
+        try:
+            handle = _handlers()[job.kind]
+            total, records, workbook = read_sheet(path)
+            job.total_rows = total
+            db.session.commit()
+
+            for chunk in _chunks(records, chunk_size):
+                try:
+                    inserted, errors = handle(chunk)
+                except Exception:
+                    db.session.rollback()
+                    raise
+                job = db.session.get(ImportJob, job_id)
+                job.processed_rows += len(chunk)
+                job.inserted += inserted
+                job.failed += len(errors)
+                if len(job.errors) < max_errors:
+                    job.errors = job.errors + errors[:max_errors - len(job.errors)]
+                db.session.commit()
+
+            job.total_rows = job.processed_rows  # the sheet dimensions count blank rows
+            job.status = "completed"
+        except Exception as e:
+            logger.exception("Import job %s failed", job_id)
+            db.session.rollback()
+            job = db.session.get(ImportJob, job_id)
+            job.status = "failed"
+            job.message = str(e)[:500]
+        finally:
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            db.session.remove()
+            if workbook is not None:
+                workbook.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# ---------------- JOB OWNERSHIP ----------------
+# Jobs run in this process's thread pool, so they stop with it: a deploy, a
+# crash or gunicorn recycling a worker after max_requests. Each process that
+# accepts imports holds a session-level advisory lock on a dedicated
+# connection and stamps its key on its jobs. Postgres frees the lock when that
+# connection drops, however the process ended, so a queued or running job
+# whose owner's key can be locked belongs to nobody.
+OWNER_LOCK_CLASS = 0x494D  # first key of the two-key advisory locks used here
+
+_owner = None  # (pid, key, connection)
+_owner_lock = threading.Lock()
+
+
+def _owner_key():
+    global _owner
+    with _owner_lock:
+        if _owner is None or _owner[0] != os.getpid():
+            engine = db.engine
+            cargs, cparams = engine.dialect.create_connect_args(engine.url)
+            connection = engine.dialect.dbapi.connect(*cargs, **cparams)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                while True:
+                    key = random.randint(1, 2**31 - 1)
+                    cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", (OWNER_LOCK_CLASS, key))
+                    if cursor.fetchone()[0]:
+                        break
+            _owner = (os.getpid(), key, connection)
+        return _owner[1]
+
+
+def fail_orphaned_jobs():
+    """Mark queued or running jobs whose process is gone as failed. Returns how many."""
+    # The transaction-level try-lock succeeds only for a dead owner and is released at commit
+    result = db.session.execute(text("""
+        UPDATE import_jobs
+        SET status = 'failed', finished_at = now() AT TIME ZONE 'utc',
+            message = 'Interrupted: the server process running this import stopped after '
+                      || processed_rows || ' rows. Re-upload the rows not yet inserted.'
+        WHERE status IN ('queued', 'running')
+          AND (owner IS NULL OR pg_try_advisory_xact_lock(:lock_class, owner))
+    """), {"lock_class": OWNER_LOCK_CLASS})
+    db.session.commit()
+    if result.rowcount:
+        logger.warning("Marked %d orphaned import jobs as failed", result.rowcount)
+    return result.rowcount
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get("IMPORT_WORKERS", 2),
+                    thread_name_prefix="import",
+                )
+    return _executor
+
+
+def start_import(kind, file_storage):
+    """Save the upload, record a queued job and hand it to the local worker pool"""
+    fail_orphaned_jobs()
+    job = ImportJob(
+        id=uuid.uuid4(), kind=kind, filename=file_storage.filename, status="queued", errors=[],
+        owner=_owner_key(),
+    )
+    upload_dir = current_app.config["IMPORT_UPLOAD_DIR"]
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f"{job.id}.xlsx")
+    file_storage.save(path)
+
+    db.session.add(job)
+    db.session.commit()
+    _get_executor().submit(run_import, current_app._get_current_object(), job.id, path)
+    return job
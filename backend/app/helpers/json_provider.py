@@ -0,0 +1,40 @@
+# app/helpers/json_provider.py
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+from app.helpers.metrics import track_serialization
+
+
+def _default(obj):
+    """
+    Decimal, the one column type orjson does not serialize natively (UUID,
+    date, time, datetime and Enum it does). Anything else is a bug in the
+    view and raises TypeError, as Flask's default provider would.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson. UUID, date, time, datetime and Enum
+    values are serialized natively (str(uuid), ISO 8601, the enum's value),
+    so views can return column values as fetched.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with track_serialization():
+            body = orjson.dumps(obj, default=_default, option=self.options)
+        return self._app.response_class(body, mimetype="application/json")
@@ -0,0 +1,165 @@
+# app/helpers/live.py
+import logging
+import queue
+import select
+import threading
+import time
+
+import orjson
+
+from app.database import db
+from app.helpers.versioning import CHANGES_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+class StreamFull(Exception):
+    """Raised when a process already serves its maximum number of streams"""
+
+
+class LiveAggregates:
+    """
+    Fan-out of dashboard aggregates to server-sent-event streams.
+
+    One listener thread per process LISTENs on CHANGES_CHANNEL, which the
+    versioning hooks NOTIFY inside every writing transaction, so only
+    committed writes arrive. Bursts are coalesced, each affected aggregate
+    is recomputed once, and the encoded event is handed to every connected
+    stream. No client ever triggers a query of its own.
+    """
+
+    def __init__(self, aggregates):
+        self.aggregates = aggregates    # {name: (tables, compute)}
+        self.latest = {}                # {name: last computed value}
+        self.message = None             # latest encoded event, shared by all streams
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._compute_lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    # --- Streams ---
+    def subscribe(self, app):
+        """A queue that always holds the newest event not yet sent to this stream"""
+        with self._lock:
+            if len(self._subscribers) >= app.config.get("STATS_STREAM_MAX_CLIENTS", 10):
+                raise StreamFull()
+            subscriber = queue.Queue(maxsize=1)
+            self._subscribers.add(subscriber)
+            self._start(app)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def snapshot(self):
+        """The current event; computed here only before the first change arrives"""
+        with self._compute_lock:
+            if self.message is None:
+                self._refresh(self.aggregates)
+            return self.message
+
+    def _publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.get_nowait()  # a newer snapshot replaces one still unsent
+            except queue.Empty:
+                pass
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass
+
+    # --- Aggregates ---
+    def _refresh(self, names):
+        """Recompute the named aggregates and encode the event (caller holds _compute_lock)"""
+        try:
+            for name in names:
+                self.latest[name] = self.aggregates[name][1]()
+        finally:
+            db.session.remove()
+        body = orjson.dumps(
+            {"changed": sorted(names), **self.latest},
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+        self.message = b"event: stats\ndata: " + body + b"\n\n"
+        return self.message
+
+    def _affected(self, tables):
+        return [name for name, (depends_on, _) in self.aggregates.items() if depends_on & tables]
+
+    # --- Listener ---
+    def _start(self, app):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._app = app
+        # Started lazily, so with gunicorn's preload_app each worker gets its own
+        self._thread = threading.Thread(target=self._run, name="live-aggregates", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        """A dedicated connection outside the pool: LISTEN holds it for the process lifetime"""
+        engine = db.engine
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        connection = engine.dialect.dbapi.connect(*cargs, **cparams)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANGES_CHANNEL}")
+        return connection
+
+    def _drain(self, connection, timeout):
+        """Table names from the notifications received within timeout seconds"""
+        tables = set()
+        if select.select([connection], [], [], max(timeout, 0))[0]:
+            connection.poll()
+            while connection.notifies:
+                tables.update(connection.notifies.pop(0).payload.split(","))
+        return tables
+
+    def _run(self):
+        app = self._app
+        min_interval = app.config.get("STATS_STREAM_MIN_INTERVAL_MS", 1000) / 1000
+        heartbeat = app.config.get("STATS_STREAM_HEARTBEAT", 15)
+        backoff = 1
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    self.message = None  # no longer kept current
+                    return
+            connection = None
+            try:
+                with app.app_context():
+                    connection = self._connect()
+                    # Anything may have changed while nobody was listening
+                    with self._compute_lock:
+                        self._publish(self._refresh(self.aggregates))
+                    backoff = 1
+                    last = 0.0
+                    while True:
+                        with self._lock:
+                            if not self._subscribers:
+                                break
+                        tables = self._drain(connection, heartbeat)
+                        if not tables:
+                            continue
+                        # Collect the rest of a burst (e.g. a chunked import) before recomputing
+                        while time.monotonic() - last < min_interval:
+                            tables |= self._drain(connection, min_interval - (time.monotonic() - last))
+                        names = self._affected(tables)
+                        if names:
+                            with self._compute_lock:
+                                self._publish(self._refresh(names))
+                        last = time.monotonic()
+            except Exception:
+                logger.exception("Live aggregate listener failed; reconnecting in %ss", backoff)
+                with self._compute_lock:
+                    self.message = None  # stale until the next successful refresh
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if connection is not None:
+                    connection.close()
@@ -0,0 +1,213 @@
+# app/helpers/metrics.py
+import logging
+import os
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+
+from flask import Blueprint, Response, current_app, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Under gunicorn, set PROMETHEUS_MULTIPROC_DIR so /metrics aggregates all workers
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+
+REQUEST_LATENCY = Histogram(
+    "msme_request_duration_seconds", "Request handling time", ["method", "route", "status"],
+)
+REQUEST_DB_TIME = Histogram(
+    "msme_request_db_seconds", "Time spent in SQL statements per request", ["method", "route"],
+)
+REQUEST_SERIALIZATION_TIME = Histogram(
+    "msme_request_serialization_seconds", "Time spent encoding JSON per request", ["method", "route"],
+)
+REQUEST_STATEMENTS = Histogram(
+    "msme_request_statements", "SQL statements executed per request", ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+SLOW_REQUESTS = Counter(
+    "msme_slow_requests_total", "Requests logged as slow or N+1", ["method", "route", "reason"],
+)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "msme_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "msme_db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout",
+)
+POOL_CHECKED_OUT = Gauge(
+    "msme_db_pool_checked_out", "Connections currently checked out", multiprocess_mode="livesum",
+)
+POOL_CONNECTIONS = Gauge(
+    "msme_db_pool_connections", "Open database connections", multiprocess_mode="livesum",
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+# --- Pool and statement events ---
+@event.listens_for(Pool, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.inc()
+
+
+@event.listens_for(Pool, "close")
+def _on_close(dbapi_connection, connection_record):
+    POOL_CONNECTIONS.dec()
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    POOL_CHECKED_OUT.dec()
+
+
+def _request_stats():
+    if has_request_context():
+        return g.get("request_stats")
+    return None
+
+
+# The start time lives on the execution context, one per statement, so a
+# statement that raises leaves nothing behind on the pooled connection
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _request_stats() is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record_statement(context, statement):
+    start = getattr(context, "_query_start", None)
+    stats = _request_stats()
+    if start is None or stats is None:
+        return
+    del context._query_start
+    stats["db_time"] += time.perf_counter() - start
+    stats["statements"][statement] += 1
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_statement(context, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements count too; after_cursor_execute never runs for them
+    _record_statement(exception_context.execution_context, exception_context.statement)
+
+
+@contextmanager
+def track_serialization():
+    """Add the time spent in the block to the current request's serialization time"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats()
+        if stats is not None:
+            stats["serialization_time"] += time.perf_counter() - start
+
+
+# --- Request hooks ---
+def _start_request():
+    g.request_stats = {
+        "start": time.perf_counter(),
+        "db_time": 0.0,
+        "serialization_time": 0.0,
+        "statements": StatementCounter(),
+    }
+
+
+def _finish_request(response):
+    stats = g.pop("request_stats", None)
+    if stats is None or request.endpoint == "metrics_bp.metrics":
+        return response
+
+    elapsed = time.perf_counter() - stats["start"]
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    method = request.method
+    statements = sum(stats["statements"].values())
+
+    REQUEST_LATENCY.labels(method, route, response.status_code).observe(elapsed)
+    REQUEST_DB_TIME.labels(method, route).observe(stats["db_time"])
+    REQUEST_SERIALIZATION_TIME.labels(method, route).observe(stats["serialization_time"])
+    REQUEST_STATEMENTS.labels(method, route).observe(statements)
+
+    slow_ms = current_app.config.get("SLOW_REQUEST_MS", 500)
+    repeat_limit = current_app.config.get("N_PLUS_ONE_THRESHOLD", 10)
+    top_statement, top_count = (stats["statements"].most_common(1) or [(None, 0)])[0]
+
+    reasons = []
+    if elapsed * 1000 >= slow_ms:
+        reasons.append("slow")
+    if top_count >= repeat_limit:
+        reasons.append("n_plus_one")
+    for reason in reasons:
+        SLOW_REQUESTS.labels(method, route, reason).inc()
+    if reasons:
+        logger.warning(
+            "%s %s %s: %.1f ms, %d statements, db %.1f ms, serialization %.1f ms%s",
+            "+".join(reasons), method, route, elapsed * 1000, statements,
+            stats["db_time"] * 1000, stats["serialization_time"] * 1000,
+            f", repeated {top_count}x: {' '.join(top_statement.split())[:200]}" if top_count >= repeat_limit else "",
+        )
+    return response
+
+
+# --- GET: Prometheus metrics ---
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        body = generate_latest(registry)
+    else:
+        body = generate_latest()
+    return Response(body, mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+    Record statement count, DB time, serialization time and latency for every
+    request. Call before db.init_app so the engine gets the instrumented pool.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    options.setdefault("poolclass", InstrumentedQueuePool)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.register_blueprint(metrics_bp)
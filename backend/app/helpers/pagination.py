@@ -0,0 +1,150 @@
+# app/helpers/pagination.py
+import base64
+from datetime import datetime, time, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, or_, tuple_
+
+from app.models.candidates import Candidate
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(created_at, record_id):
+    """Opaque cursor for the (created_at, id) position of the last row on a page"""
+    stamp = created_at.isoformat() if created_at else ""
+    raw = f"{stamp}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Returns (created_at or None, id). Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        stamp, record_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return (datetime.fromisoformat(stamp) if stamp else None), UUID(record_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def get_page_size(args):
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def parse_date(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"{name} must be in YYYY-MM-DD format")
+
+
+def apply_filters(query, model, args, candidate_joined=False):
+    """
+    Server-side filters shared by the list endpoints:
+    status, gender, district, session, candidate_id, date_from, date_to.
+    Candidate attributes on child tables are filtered through a join,
+    added here unless the caller has already joined candidates.
+    """
+    joined = candidate_joined or model is Candidate
+
+    def candidate_column(name):
+        nonlocal query, joined
+        if not joined:
+            query = query.join(Candidate, Candidate.id == model.candidate_id)
+            joined = True
+        return getattr(Candidate, name)
+
+    status = args.get("status")
+    if status:
+        column = model.status if hasattr(model, "status") else candidate_column("status")
+        query = query.filter(column == status)
+
+    for name in ("gender", "district"):
+        value = args.get(name)
+        if value:
+            column = candidate_column(name)
+            query = query.filter(column == value)
+
+    session = args.get("session")
+    if session:
+        if not hasattr(model, "session_name"):
+            raise ValueError("session filter is not supported here")
+        # JSONB containment, served by the GIN index on session_name
+        query = query.filter(model.session_name.contains([session]))
+
+    candidate_id = args.get("candidate_id")
+    if candidate_id:
+        if not hasattr(model, "candidate_id"):
+            raise ValueError("candidate_id filter is not supported here")
+        try:
+            query = query.filter(model.candidate_id == UUID(candidate_id))
+        except ValueError:
+            raise ValueError("candidate_id must be a valid UUID")
+
+    # Records with their own date are filtered on it, others on created_at
+    date_column = model.date if hasattr(model, "date") else model.created_at
+    date_from = args.get("date_from")
+    if date_from:
+        query = query.filter(date_column >= parse_date(date_from, "date_from"))
+    date_to = args.get("date_to")
+    if date_to:
+        day = parse_date(date_to, "date_to")
+        if date_column is model.created_at:
+            # Half-open bound keeps the created_at index usable
+            query = query.filter(date_column < datetime.combine(day + timedelta(days=1), time.min))
+        else:
+            query = query.filter(date_column <= day)
+
+    return query
+
+
+def get_sort_order(args):
+    order = args.get("order", "desc").lower()
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    return order
+
+
+def paginate(query, model, args):
+    """
+    Keyset pagination on (created_at, id), newest first unless order=asc.
+    Rows without created_at sort as if newest (Postgres' default NULL
+    placement), so both directions walk the (created_at, id) index.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    limit = get_page_size(args)
+    descending = get_sort_order(args) == "desc"
+    cursor = args.get("cursor")
+
+    if cursor:
+        created_at, record_id = decode_cursor(cursor)
+        key = tuple_(model.created_at, model.id)
+        if created_at is None and descending:
+            query = query.filter(or_(
+                and_(model.created_at.is_(None), model.id < record_id),
+                model.created_at.isnot(None),
+            ))
+        elif created_at is None:
+            query = query.filter(and_(model.created_at.is_(None), model.id > record_id))
+        elif descending:
+            query = query.filter(key < tuple_(created_at, record_id))
+        else:
+            query = query.filter(or_(key > tuple_(created_at, record_id), model.created_at.is_(None)))
+
+    if descending:
+        ordering = (model.created_at.desc(), model.id.desc())
+    else:
+        ordering = (model.created_at.asc(), model.id.asc())
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return rows, next_cursor
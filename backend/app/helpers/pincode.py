@@ -0,0 +1,287 @@
+# app/helpers/pincode.py
+import os
+import threading
+import logging
+
+import click
+import numpy as np
+import pandas as pd
+from flask import current_app
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+
+class PincodeSnapshotMissing(RuntimeError):
+    """The offline snapshot has not been built; lookups never fall back to the network"""
+
+
+def _clean(value):
+    """Convert NaN/None to None, else a stripped string"""
+    if value is None or pd.isna(value):
+        return None
+    return str(value).strip()
+
+
+def _place_key(value):
+    """Case and whitespace insensitive place name: ' Bangalore  North' -> 'bangalore north'"""
+    return " ".join(str(value or "").split()).casefold()
+
+
+def _to_code(pincode):
+    """Indian pincodes are six digits; anything else can never match"""
+    text = str(pincode).strip()
+    if len(text) != 6 or not text.isdigit():
+        return None
+    return int(text)
+
+
+class PincodeIndex:
+    """
+    Array-backed pincode -> (city, taluk, district, state) index.
+    Codes are kept sorted so single and batch lookups are a binary search.
+    city is the post office's place name, taluk the sub-district (admin3).
+    """
+
+    def __init__(self, codes, city, district, state, names, taluk=None):
+        self.codes = codes          # int32, sorted
+        self.city = city            # int32 offsets into names (-1 = missing)
+        self.district = district
+        self.state = state
+        self.taluk = taluk if taluk is not None else np.full(len(codes), -1, dtype=np.int32)
+        self.names = names          # list of unique strings
+        self._reverse = None        # built on first reverse lookup
+
+    def __len__(self):
+        return len(self.codes)
+
+    # --- Builders ---
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build from a frame with postal_code, place_name, county_name, state_name
+        and optionally community_name (the taluk). Mirrors pgeocode: first
+        place name, district and state per pincode; first known taluk.
+        """
+        df = df.reindex(columns=["postal_code", "place_name", "county_name", "state_name", "community_name"])
+        df["code"] = df["postal_code"].map(_to_code)
+        df = df.dropna(subset=["code", "place_name"])
+        taluks = df.dropna(subset=["community_name"]).drop_duplicates("code").set_index("code")["community_name"]
+        df = df.drop_duplicates("code", keep="first").sort_values("code")
+
+        names, offsets = [], {}
+
+        def intern(value):
+            if value is None:
+                return -1
+            if value not in offsets:
+                offsets[value] = len(names)
+                names.append(value)
+            return offsets[value]
+
+        city = [intern(_clean(v).split(",")[0].strip()) for v in df["place_name"]]
+        district = [intern(_clean(v)) for v in df["county_name"]]
+        state = [intern(_clean(v)) for v in df["state_name"]]
+        taluk = [intern(_clean(taluks.get(code))) for code in df["code"]]
+
+        return cls(
+            codes=df["code"].to_numpy(dtype=np.int32),
+            city=np.asarray(city, dtype=np.int32),
+            district=np.asarray(district, dtype=np.int32),
+            state=np.asarray(state, dtype=np.int32),
+            names=names,
+            taluk=np.asarray(taluk, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_pgeocode(cls):
+        """Build from pgeocode's dataset (downloads it once if not cached on disk)"""
+        import pgeocode
+
+        nomi = pgeocode.Nominatim('IN')
+        return cls.from_dataframe(nomi._data)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if "taluk" not in data.files:
+                logger.warning("%s has no taluks; rebuild it with `flask pincode-snapshot`", path)
+            return cls(
+                codes=data["codes"],
+                city=data["city"],
+                district=data["district"],
+                state=data["state"],
+                names=data["names"].tolist(),
+                taluk=data["taluk"] if "taluk" in data.files else None,
+            )
+
+    @staticmethod
+    def has_taluks(path):
+        """True when the snapshot at path was built with the taluk column"""
+        with np.load(path, allow_pickle=False) as data:
+            return "taluk" in data.files
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(
+            path,
+            codes=self.codes,
+            city=self.city,
+            district=self.district,
+            state=self.state,
+            taluk=self.taluk,
+            names=np.asarray(self.names, dtype=str),
+        )
+
+    # --- Lookups ---
+    def _name(self, offset):
+        return self.names[offset] if offset >= 0 else None
+
+    def _location(self, pos):
+        return {
+            "city": self._name(self.city[pos]),
+            "district": self._name(self.district[pos]),
+            "state": self._name(self.state[pos]),
+        }
+
+    def lookup(self, pincode):
+        code = _to_code(pincode)
+        if code is None:
+            return None
+        pos = np.searchsorted(self.codes, code)
+        if pos < len(self.codes) and self.codes[pos] == code:
+            return self._location(pos)
+        return None
+
+    # --- Reverse lookups ---
+    def _reverse_maps(self):
+        """
+        (state, district, taluk) -> pincode, (state, district, city) -> pincode
+        and (state, district) -> pincode. Codes are sorted, so each place maps
+        to its lowest pincode.
+        """
+        if self._reverse is None:
+            keys = [_place_key(name) for name in self.names]
+            by_taluk, by_place, by_district = {}, {}, {}
+            for code, c, t, d, s in zip(self.codes.tolist(), self.city.tolist(), self.taluk.tolist(),
+                                        self.district.tolist(), self.state.tolist()):
+                if d < 0 or s < 0:
+                    continue
+                pincode = f"{code:06d}"
+                by_district.setdefault((keys[s], keys[d]), pincode)
+                if t >= 0:
+                    by_taluk.setdefault((keys[s], keys[d], keys[t]), pincode)
+                if c >= 0:
+                    by_place.setdefault((keys[s], keys[d], keys[c]), pincode)
+            self._reverse = (by_taluk, by_place, by_district)
+        return self._reverse
+
+    def reverse_lookup(self, state, district, taluk=None, district_fallback=True):
+        """
+        A pincode for the place: the taluk is matched against the taluk
+        (admin3) names first, then against post office place names, which
+        often carry the taluk's headquarters town. With district_fallback,
+        falls back to any pincode in the district.
+        """
+        by_taluk, by_place, by_district = self._reverse_maps()
+        state, district = _place_key(state), _place_key(district)
+        if taluk:
+            key = (state, district, _place_key(taluk))
+            pincode = by_taluk.get(key) or by_place.get(key)
+            if pincode:
+                return pincode
+        return by_district.get((state, district)) if district_fallback else None
+
+    def reverse_lookup_many(self, places, district_fallback=True):
+        """Returns {(state, district, taluk): pincode or None}, each distinct normalized place looked up once"""
+        result, by_key = {}, {}
+        for place in places:
+            key = tuple(_place_key(part) for part in place)
+            if key not in by_key:
+                by_key[key] = self.reverse_lookup(*key, district_fallback=district_fallback)
+            result[place] = by_key[key]
+        return result
+
+    def lookup_many(self, pincodes):
+        """Returns {pincode: location or None} for every distinct input pincode"""
+        keys = list(dict.fromkeys(str(p).strip() for p in pincodes))
+        result = dict.fromkeys(keys)
+        parsed = [(k, _to_code(k)) for k in keys]
+        parsed = [(k, c) for k, c in parsed if c is not None]
+        if not parsed or not len(self.codes):
+            return result
+
+        wanted = np.fromiter((c for _, c in parsed), dtype=np.int64, count=len(parsed))
+        pos = np.searchsorted(self.codes, wanted)
+        pos_clipped = np.minimum(pos, len(self.codes) - 1)
+        found = self.codes[pos_clipped] == wanted
+
+        for (key, _), p, hit in zip(parsed, pos_clipped, found):
+            if hit:
+                result[key] = self._location(p)
+        return result
+
+
+# --- Process-wide index ---
+_index = None
+_index_lock = threading.Lock()
+
+
+def _load_index(snapshot_path):
+    if not os.path.exists(snapshot_path):
+        raise PincodeSnapshotMissing(
+            f"Pincode snapshot {snapshot_path} not found. Build it once with `flask pincode-snapshot` "
+            "(downloads pgeocode's India dataset) or point PINCODE_SNAPSHOT_PATH at an existing one."
+        )
+    return PincodeIndex.load(snapshot_path)
+
+
+def _snapshot_path():
+    try:
+        return current_app.config["PINCODE_SNAPSHOT_PATH"]
+    except RuntimeError:
+        # Outside an app context (scripts, shells)
+        from app.config import Config
+        return Config.PINCODE_SNAPSHOT_PATH
+
+
+def get_pincode_index():
+    """Return the shared index, loading it on first use. Raises PincodeSnapshotMissing."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _load_index(_snapshot_path())
+    return _index
+
+
+def init_pincode_index(app):
+    """Preload the index at startup so no request pays for it"""
+    global _index
+    app.cli.add_command(pincode_snapshot_command)
+
+    if not app.config.get("PINCODE_PRELOAD", True):
+        return
+    try:
+        with _index_lock:
+            _index = _load_index(app.config["PINCODE_SNAPSHOT_PATH"])
+        logger.info("Loaded %d pincodes", len(_index))
+    except PincodeSnapshotMissing as e:
+        # The CLI (including `flask pincode-snapshot`) must still start;
+        # wsgi.py refuses to serve without it and lookups raise the same error
+        logger.error("%s", e)
+
+
+@click.command("pincode-snapshot")
+@with_appcontext
+@click.option("--output", default=None, help="Snapshot path (defaults to PINCODE_SNAPSHOT_PATH)")
+@click.option("--if-missing", is_flag=True, help="Do nothing when an up-to-date snapshot already exists")
+def pincode_snapshot_command(output, if_missing):
+    """Build the offline pincode snapshot from pgeocode's dataset."""
+    path = output or current_app.config["PINCODE_SNAPSHOT_PATH"]
+    if if_missing and os.path.exists(path) and PincodeIndex.has_taluks(path):
+        click.echo(f"ok      {path} already exists")
+        return
+    index = PincodeIndex.from_pgeocode()
+    index.save(path)
+    click.echo(f"Wrote {len(index)} pincodes to {path}")
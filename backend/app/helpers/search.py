@@ -0,0 +1,104 @@
+# app/helpers/search.py
+from sqlalchemy import Integer, Text, and_, column, func, or_, select, true, values
+
+from app.database import db
+from app.models.candidates import Candidate
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+# Fields a search can match on; each one is backed by a trigram index
+SEARCH_FIELDS = ("name", "district", "taluk")
+
+RESULT_COLUMNS = (
+    Candidate.id, Candidate.name, Candidate.contact, Candidate.gender, Candidate.state,
+    Candidate.district, Candidate.taluk, Candidate.pin_code, Candidate.status,
+)
+
+
+def get_search_limit(value, default=DEFAULT_SEARCH_LIMIT):
+    try:
+        limit = int(value if value is not None else default)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, MAX_SEARCH_LIMIT))
+
+
+def _like_pattern(text):
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _match(field, term):
+    """Trigram similarity (%) or substring match; both are served by the GIN index"""
+    col = getattr(Candidate, field)
+    return or_(col.op("%")(term), col.ilike(_like_pattern(term), escape="\\"))
+
+
+def _result(item):
+    item["score"] = round(item["score"], 3)
+    return item
+
+
+def search_candidates(terms, limit):
+    """
+    Ranked candidates matching every given field in terms ({field: text}).
+    The score is the summed trigram similarity over those fields.
+    """
+    terms = {field: text.strip() for field, text in terms.items() if text and text.strip()}
+    if not terms:
+        raise ValueError(f"Provide at least one of: {', '.join(SEARCH_FIELDS)}")
+
+    score = sum(func.similarity(getattr(Candidate, field), text) for field, text in terms.items())
+    rows = (
+        db.session.query(*RESULT_COLUMNS, score.label("score"))
+        .filter(and_(*(_match(field, text) for field, text in terms.items())))
+        .order_by(score.desc(), Candidate.name, Candidate.id)
+        .limit(limit)
+        .all()
+    )
+    return [_result(row._asdict()) for row in rows]
+
+
+def search_candidates_batch(queries, limit):
+    """
+    Resolve many names in one statement: each query ({"name", "district"?,
+    "taluk"?}) runs as a LATERAL trigram lookup against the name index.
+    Returns the ranked matches for each query, in input order.
+    """
+    if not queries:
+        return []
+
+    q = values(
+        column("idx", Integer), column("name", Text), column("district", Text), column("taluk", Text),
+        name="q",
+    ).data([
+        (index, query["name"], query.get("district"), query.get("taluk"))
+        for index, query in enumerate(queries)
+    ])
+
+    score = (
+        func.similarity(Candidate.name, q.c.name)
+        + func.coalesce(func.similarity(Candidate.district, q.c.district), 0)
+        + func.coalesce(func.similarity(Candidate.taluk, q.c.taluk), 0)
+    )
+    matches = (
+        select(*RESULT_COLUMNS, score.label("score"))
+        .where(
+            Candidate.name.op("%")(q.c.name),
+            or_(q.c.district.is_(None), Candidate.district.op("%")(q.c.district)),
+            or_(q.c.taluk.is_(None), Candidate.taluk.op("%")(q.c.taluk)),
+        )
+        .order_by(score.desc(), Candidate.name, Candidate.id)
+        .limit(limit)
+        .lateral("m")
+    )
+    rows = db.session.execute(
+        select(q.c.idx, *matches.c).select_from(q).join(matches, true()).order_by(q.c.idx, matches.c.score.desc())
+    ).all()
+
+    results = [[] for _ in queries]
+    for row in rows:
+        item = row._asdict()
+        results[item.pop("idx")].append(_result(item))
+    return results
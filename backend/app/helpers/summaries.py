@@ -0,0 +1,211 @@
+# app/helpers/summaries.py
+import sys
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, BigInteger, cast, event, func, text
+
+from app.database import db
+from app.models.candidates import Candidate
+from app.models.candidate_count import CandidateCount
+from app.models.attendance import Attendance
+from app.models.attendance_daily import AttendanceDaily
+
+# Grain of candidate_counts; every breakdown the dashboards and reports need
+SUMMARY_COLUMNS = (
+    "state", "district", "taluk", "status", "gender", "disability_cat", "phone_type", "udyam_certificate",
+)
+_COLS = ", ".join(SUMMARY_COLUMNS)
+
+
+def _upsert(select_sql):
+    # Sorted so concurrent writers lock counter rows in the same order
+    return f"""
+        INSERT INTO candidate_counts AS c ({_COLS}, count)
+        {select_sql}
+        ORDER BY {_COLS}
+        ON CONFLICT ({_COLS}) DO UPDATE SET count = c.count + EXCLUDED.count;"""
+
+
+# Statement-level triggers with transition tables: a bulk INSERT, a COPY or a
+# multi-row UPDATE adjusts each affected counter once, not once per row.
+TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION candidate_counts_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_upsert(f"SELECT {_COLS}, count(*) FROM new_rows GROUP BY {_COLS}")}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_upsert(f"SELECT {_COLS}, -count(*) FROM old_rows GROUP BY {_COLS}")}
+    ELSE
+        {_upsert(f'''SELECT {_COLS}, sum(delta) FROM (
+            SELECT {_COLS}, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT {_COLS}, -1 AS delta FROM old_rows
+        ) d GROUP BY {_COLS} HAVING sum(delta) <> 0''')}
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION candidate_counts_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM candidate_counts;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS candidate_counts_insert ON candidates;
+CREATE TRIGGER candidate_counts_insert AFTER INSERT ON candidates
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_counts_apply();
+
+DROP TRIGGER IF EXISTS candidate_counts_update ON candidates;
+CREATE TRIGGER candidate_counts_update AFTER UPDATE ON candidates
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_counts_apply();
+
+DROP TRIGGER IF EXISTS candidate_counts_delete ON candidates;
+CREATE TRIGGER candidate_counts_delete AFTER DELETE ON candidates
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_counts_apply();
+
+DROP TRIGGER IF EXISTS candidate_counts_truncate ON candidates;
+CREATE TRIGGER candidate_counts_truncate AFTER TRUNCATE ON candidates
+    FOR EACH STATEMENT EXECUTE FUNCTION candidate_counts_reset();
+"""
+
+# db.create_all() creates candidate_counts after candidates, then installs the triggers
+CandidateCount.__table__.add_is_dependent_on(Candidate.__table__)
+event.listen(CandidateCount.__table__, 'after_create', DDL(TRIGGER_SQL))
+
+
+def candidate_counts(*columns):
+    """
+    Candidate counts grouped by the given CandidateCount columns, read from the
+    summary table: cost grows with the number of groups, not candidates.
+    """
+    total = cast(func.sum(CandidateCount.count), BigInteger).label("count")
+    return (
+        db.session.query(*columns, total)
+        .group_by(*columns)
+        .having(func.sum(CandidateCount.count) > 0)
+    )
+
+
+# --- Attendance per day ---
+def _attendance_changes(source, sign):
+    """
+    One row per record for the whole day (session '') plus one per distinct
+    session it lists; rows saved without sessions hold a JSON null or [].
+    """
+    return f"""
+            SELECT date, '' AS session, {sign} AS records, {sign} * attended::int AS attended FROM {source}
+            UNION ALL
+            SELECT a.date, s.session, {sign}, {sign} * a.attended::int FROM {source} a
+            CROSS JOIN LATERAL (
+                SELECT DISTINCT value AS session FROM jsonb_array_elements_text(
+                    CASE WHEN jsonb_typeof(a.session_name) = 'array' THEN a.session_name END)
+            ) s"""
+
+
+def _daily_upsert(changes):
+    return f"""
+        INSERT INTO attendance_daily AS d (date, session, records, attended)
+        SELECT date, session, sum(records), sum(attended) FROM ({changes}
+        ) c GROUP BY date, session HAVING sum(records) <> 0 OR sum(attended) <> 0
+        ORDER BY date, session
+        ON CONFLICT (date, session) DO UPDATE
+            SET records = d.records + EXCLUDED.records, attended = d.attended + EXCLUDED.attended;"""
+
+
+ATTENDANCE_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION attendance_daily_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_daily_upsert(_attendance_changes("new_rows", 1))}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_daily_upsert(_attendance_changes("old_rows", -1))}
+    ELSE
+        {_daily_upsert(_attendance_changes("new_rows", 1) + " UNION ALL" + _attendance_changes("old_rows", -1))}
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION attendance_daily_reset() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM attendance_daily;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS attendance_daily_insert ON attendance;
+CREATE TRIGGER attendance_daily_insert AFTER INSERT ON attendance
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION attendance_daily_apply();
+
+DROP TRIGGER IF EXISTS attendance_daily_update ON attendance;
+CREATE TRIGGER attendance_daily_update AFTER UPDATE ON attendance
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION attendance_daily_apply();
+
+DROP TRIGGER IF EXISTS attendance_daily_delete ON attendance;
+CREATE TRIGGER attendance_daily_delete AFTER DELETE ON attendance
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION attendance_daily_apply();
+
+DROP TRIGGER IF EXISTS attendance_daily_truncate ON attendance;
+CREATE TRIGGER attendance_daily_truncate AFTER TRUNCATE ON attendance
+    FOR EACH STATEMENT EXECUTE FUNCTION attendance_daily_reset();
+"""
+
+AttendanceDaily.__table__.add_is_dependent_on(Attendance.__table__)
+event.listen(AttendanceDaily.__table__, 'after_create', DDL(ATTENDANCE_TRIGGER_SQL))
+
+
+# --- Reconciliation ---
+_ACTUAL = f"SELECT {_COLS}, count(*) AS count FROM candidates GROUP BY {_COLS}"
+_ACTUAL_DAILY = f"""
+    SELECT date, session, sum(records) AS records, sum(attended) AS attended
+    FROM ({_attendance_changes("attendance", 1)}) c GROUP BY date, session"""
+
+# (summary table, source table, trigger DDL, actual rows, drift query)
+SUMMARIES = (
+    (CandidateCount.__table__, "candidates", TRIGGER_SQL, f"({_COLS}, count) {_ACTUAL}", f"""
+        SELECT count(*) FROM ({_ACTUAL}) actual
+        FULL JOIN (SELECT * FROM candidate_counts WHERE count <> 0) stored USING ({_COLS})
+        WHERE actual.count IS DISTINCT FROM stored.count"""),
+    (AttendanceDaily.__table__, "attendance", ATTENDANCE_TRIGGER_SQL,
+     f"(date, session, records, attended) {_ACTUAL_DAILY}", f"""
+        SELECT count(*) FROM ({_ACTUAL_DAILY}) actual
+        FULL JOIN (SELECT * FROM attendance_daily WHERE records <> 0 OR attended <> 0) stored
+            USING (date, session)
+        WHERE (actual.records, actual.attended) IS DISTINCT FROM (stored.records, stored.attended)"""),
+)
+
+
+@click.command("rebuild-summaries")
+@with_appcontext
+@click.option("--check", is_flag=True, help="Only report rows that disagree with their source; exit 1 if any")
+def rebuild_summaries_command(check):
+    """
+    Install the summary tables (candidate_counts, attendance_daily) and their
+    triggers, then reconcile them with their source tables. Writes to a source
+    table wait while its summary is rebuilt.
+    """
+    stale = 0
+    for table, source, trigger_sql, actual_sql, drift_sql in SUMMARIES:
+        with db.engine.begin() as conn:
+            conn.execute(text("SET LOCAL statement_timeout = 0"))
+            if check:
+                drift = conn.execute(text(drift_sql)).scalar()
+                click.echo(f"{drift} {table.name} rows out of date")
+                stale += drift
+                continue
+
+            table.create(conn, checkfirst=True)
+            conn.execute(text(trigger_sql))
+            # SHARE blocks writers, so no trigger can change a counter mid-rebuild
+            conn.execute(text(f"LOCK TABLE {source} IN SHARE MODE"))
+            drift = conn.execute(text(drift_sql)).scalar()
+            conn.execute(text(f"DELETE FROM {table.name}"))
+            rows = conn.execute(text(f"INSERT INTO {table.name} {actual_sql}")).rowcount
+        click.echo(f"ok      {table.name}: {rows} rows, {drift} corrected")
+    if stale:
+        sys.exit(1)
@@ -1,25 +1,40 @@
-import pgeocode
 from datetime import datetime
-import pandas as pd
+
+from app.helpers.pincode import get_pincode_index
 
 
 def get_location_by_pincode(pincode):
     """
-    Look up Indian postal codes using pgeocode.
+    Look up Indian postal codes in the preloaded pincode index.
     Returns dict with city, district, state or None if not found.
     """
-    nomi = pgeocode.Nominatim('IN')
-    info = nomi.query_postal_code(str(pincode))
-    
-    if info is None or pd.isna(info.place_name):
-        return None
-    
-    city = str(info.place_name).split(",")[0].strip() if not pd.isna(info.place_name) else None
-    district = str(info.county_name).strip() if not pd.isna(info.county_name) else None
-    state = str(info.state_name).strip() if not pd.isna(info.state_name) else None
-    
-    return {
-        "city": city,
-        "district": district,
-        "state": state
-    }
+    return get_pincode_index().lookup(pincode)
+
+
+def get_locations_by_pincodes(pincodes):
+    """
+    Batch variant of get_location_by_pincode.
+    Returns {pincode: location dict or None} for every distinct pincode.
+    """
+    return get_pincode_index().lookup_many(pincodes)
+
+
+def get_pincodes_by_places(places):
+    """
+    Reverse of get_locations_by_pincodes for (state, district, taluk) places.
+    Only taluk-level matches count: returns {place: pincode or None}.
+    """
+    return get_pincode_index().reverse_lookup_many(places, district_fallback=False)
+
+
+def is_foreign_key_violation(error):
+    """True when an IntegrityError was raised by a foreign key constraint (SQLSTATE 23503)"""
+    orig = getattr(error, "orig", None)
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == "23503"
+
+
+def violated_constraint(error):
+    """Name of the constraint or unique index an IntegrityError violated, if Postgres reported one"""
+    diag = getattr(getattr(error, "orig", None), "diag", None)
+    return getattr(diag, "constraint_name", None)
@@ -7,8 +7,18 @@ class Assessment(BaseModel):
     __tablename__ = 'assessment'
 
     candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.id'), nullable=False)
+    candidate = db.relationship('Candidate', back_populates='assessments')
     training = db.Column(db.String(120), nullable=False)
     date = db.Column(db.Date, nullable=False, default=datetime.utcnow)
     status = db.Column(db.String(50), nullable=True)
     mark = db.Column(db.Integer, nullable=True)
     remarks = db.Column(db.String(255), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_assessment_candidate_id', candidate_id),
+        db.Index('ix_assessment_date', date),
+        # Per-training mark statistics read marks in order without a sort
+        db.Index('ix_assessment_training_mark', training, mark),
+        # Keyset pagination and export order
+        db.Index('ix_assessment_created_at_id', 'created_at', 'id'),
+    )
@@ -1,13 +1,26 @@
 from app.database import db
 from .base import BaseModel
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from datetime import datetime
 
 class Attendance(BaseModel):
     __tablename__ = 'attendance'
 
     candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.id'), nullable=False)
-    session_name = db.Column(JSON, nullable=True)  # List or JSON field
+    candidate = db.relationship('Candidate', back_populates='attendance')
+    session_name = db.Column(JSONB, nullable=True)  # List of session names
     attended = db.Column(db.Boolean, nullable=False)
     date = db.Column(db.Date, nullable=False, default=datetime.utcnow)
     remarks = db.Column(db.String(255), nullable=True)
+
+    __table_args__ = (
+        # Serves session membership filters: session_name @> '["<session>"]'
+        db.Index('ix_attendance_session_name', session_name, postgresql_using='gin',
+                 postgresql_ops={'session_name': 'jsonb_path_ops'}),
+        # Candidate lookups; the included flag lets district attendance series
+        # join through candidates with index-only scans
+        db.Index('ix_attendance_candidate_date', candidate_id, date, postgresql_include=['attended']),
+        db.Index('ix_attendance_date', date),
+        # Keyset pagination and export order
+        db.Index('ix_attendance_created_at_id', 'created_at', 'id'),
+    )
@@ -0,0 +1,12 @@
+from app.database import db
+
+class AttendanceDaily(db.Model):
+    __tablename__ = 'attendance_daily'
+
+    # Per-day attendance counters kept current by the triggers in
+    # app/helpers/summaries.py. session '' holds every record of the day;
+    # other rows count the records listing that session.
+    date = db.Column(db.Date, primary_key=True)
+    session = db.Column(db.Text, primary_key=True)
+    records = db.Column(db.BigInteger, nullable=False, default=0)
+    attended = db.Column(db.BigInteger, nullable=False, default=0)
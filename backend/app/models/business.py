@@ -6,7 +6,14 @@ class Business(BaseModel):
     __tablename__ = 'business'
 
     candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.id'), nullable=False)
+    candidate = db.relationship('Candidate', back_populates='business')
     customers_before = db.Column(db.Integer, nullable=True)
     customers_after = db.Column(db.Integer, nullable=True)
     income_before = db.Column(db.Float, nullable=True)
     income_after = db.Column(db.Float, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_business_candidate_id', candidate_id),
+        # Keyset pagination, export order and the default newest-first listing
+        db.Index('ix_business_created_at_id', 'created_at', 'id'),
+    )
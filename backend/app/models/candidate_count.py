@@ -0,0 +1,17 @@
+from app.database import db
+from .candidates import gender_enum, phone_type_enum, status_enum
+
+class CandidateCount(db.Model):
+    __tablename__ = 'candidate_counts'
+
+    # One row per combination of these candidate columns, kept current by the
+    # triggers in app/helpers/summaries.py. Rows can reach count 0.
+    state = db.Column(db.String(100), primary_key=True)
+    district = db.Column(db.String(100), primary_key=True)
+    taluk = db.Column(db.String(100), primary_key=True)
+    status = db.Column(status_enum, primary_key=True)
+    gender = db.Column(gender_enum, primary_key=True)
+    disability_cat = db.Column(db.Boolean, primary_key=True)
+    phone_type = db.Column(phone_type_enum, primary_key=True)
+    udyam_certificate = db.Column(db.Boolean, primary_key=True)
+    count = db.Column(db.BigInteger, nullable=False, default=0)
@@ -1,4 +1,5 @@
 from app.database import db
+from sqlalchemy import DDL, event
 from sqlalchemy.dialects.postgresql import JSON, ENUM, UUID
 from .base import BaseModel
 import uuid
@@ -29,3 +30,32 @@ class Candidate(BaseModel):
     # Status field with default "Active"
     status = db.Column(status_enum, nullable=False, default="Active")
     disability_cat = db.Column(db.Boolean, nullable=False, default=True)
+
+    # Child records; load them with selectinload() to avoid a query per candidate
+    attendance = db.relationship(
+        'Attendance', back_populates='candidate', order_by='[Attendance.date, Attendance.created_at]'
+    )
+    assessments = db.relationship(
+        'Assessment', back_populates='candidate', order_by='[Assessment.date, Assessment.created_at]'
+    )
+    business = db.relationship('Business', back_populates='candidate', order_by='Business.created_at')
+
+    __table_args__ = (
+        # Lookup key for /update-all; one candidate per contact number
+        db.Index('ux_candidates_contact', contact, unique=True),
+        # Keyset pagination and export order
+        db.Index('ix_candidates_created_at_id', 'created_at', 'id'),
+        # Region drill-downs: state, state + district, state + district + taluk
+        db.Index('ix_candidates_region', state, district, taluk),
+        # Trigram indexes for /search (similarity % and ILIKE); need the pg_trgm extension
+        db.Index('ix_candidates_name_trgm', name, postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_candidates_district_trgm', district, postgresql_using='gin',
+                 postgresql_ops={'district': 'gin_trgm_ops'}),
+        db.Index('ix_candidates_taluk_trgm', taluk, postgresql_using='gin',
+                 postgresql_ops={'taluk': 'gin_trgm_ops'}),
+    )
+
+
+# db.create_all() builds the trigram indexes right after the table
+event.listen(Candidate.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
@@ -0,0 +1,19 @@
+from app.database import db
+from .base import BaseModel
+from sqlalchemy.dialects.postgresql import JSONB
+
+class ImportJob(BaseModel):
+    __tablename__ = 'import_jobs'
+
+    kind = db.Column(db.String(20), nullable=False)          # candidates, attendance, assessment, business
+    filename = db.Column(db.String(255), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    total_rows = db.Column(db.Integer, nullable=True)        # from the sheet dimensions, when present
+    processed_rows = db.Column(db.Integer, nullable=False, default=0)
+    inserted = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(JSONB, nullable=False, default=list)  # [{"row": n, "error": "..."}], capped
+    message = db.Column(db.String(500), nullable=True)       # why a failed job stopped
+    owner = db.Column(db.Integer, nullable=True)             # advisory lock key of the process running it
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
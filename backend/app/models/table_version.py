@@ -0,0 +1,8 @@
+from app.database import db
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    # One row per versioned table, bumped in the same transaction as every write
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
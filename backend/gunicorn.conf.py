@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+# Production serving profile. Every setting can be overridden from the
+# environment; the pool sizing in app/config.py reads the same variables.
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# gthread workers: WEB_CONCURRENCY processes x WEB_THREADS threads each
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+threads = int(os.environ.get("WEB_THREADS", 4))
+
+# Requests taking longer than this are killed and the worker restarted
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically so slow leaks cannot accumulate
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = 200
+
+# Load the app (and the pincode index) once in the master so workers share
+# it copy-on-write. create_app opens no database connections, so no pooled
+# connection is ever inherited across the fork.
+preload_app = True
+
+# Set GUNICORN_ACCESS_LOG to an empty string to disable the access log
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges from the aggregated /metrics
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
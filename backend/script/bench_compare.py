@@ -0,0 +1,56 @@
+"""
+Compare two script/bench_run.py reports, e.g. the parent commit and HEAD.
+
+    python script/bench_compare.py bench-base.json bench-head.json
+    python script/bench_compare.py bench-base.json bench-head.json --metric p99_ms --threshold 0.2
+
+Prints the per-endpoint change and exits with status 1 when any endpoint's
+metric got slower by more than --threshold (a fraction; 0.1 = 10%).
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before failing")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="ignore endpoints faster than this in both runs (timer noise)")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    if base["meta"].get("rows") != head["meta"].get("rows"):
+        print(f"warning: row counts differ {base['meta'].get('rows')} vs {head['meta'].get('rows')}")
+
+    print(f"{'endpoint':<32}{'base':>10}{'head':>10}{'change':>9}")
+    regressions = []
+    for name, new in head["results"].items():
+        old = base["results"].get(name)
+        if old is None or old.get(args.metric) is None or new.get(args.metric) is None:
+            print(f"{name:<32}{'-':>10}{new.get(args.metric) or 0:>10.2f}{'new':>9}")
+            continue
+        before, after = old[args.metric], new[args.metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold and max(before, after) >= args.min_ms:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32}{before:>10.2f}{after:>10.2f}{change:>+9.1%}{flag}")
+
+    print(f"peak RSS: {base.get('peak_rss_mb')} MB -> {head.get('peak_rss_mb')} MB")
+    if regressions:
+        print(f"{len(regressions)} endpoints slower than {args.threshold:.0%} on {args.metric}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
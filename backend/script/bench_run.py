@@ -0,0 +1,477 @@
+"""
+Drive every endpoint in app/api against the database in DATABASE_URL (seed
+it first with script/bench_seed.py) and write latency percentiles,
+throughput and peak RSS as JSON, for comparison with script/bench_compare.py.
+
+    cd backend
+    python script/bench_run.py --output bench-$(git rev-parse --short HEAD).json
+    python script/bench_run.py --only stats --iterations 200
+
+Requests go through Flask's test client in this process, so the numbers
+cover routing, validation, SQL and serialization without network noise.
+The stats stream is timed to its first event; a spreadsheet import is timed
+from upload until its job finishes.
+Write endpoints only touch rows the run creates itself and removes again;
+the delete-all endpoints wipe the data set and only run with --destructive.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.database import db  # noqa: E402
+from app.models.candidates import Candidate  # noqa: E402
+from app.models.attendance import Attendance  # noqa: E402
+from app.models.assessment import Assessment  # noqa: E402
+from app.models.business import Business  # noqa: E402
+from app.models.import_job import ImportJob  # noqa: E402
+
+MODELS = (Candidate, Attendance, Assessment, Business)
+UPLOAD_NAME = "bench_run.xlsx"  # import jobs of the run, removed by cleanup()
+
+
+# ---------------- HELPERS ----------------
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sample_ids(model, count, rng):
+    """A reproducible sample of existing ids without scanning the table"""
+    table = model.__tablename__
+    rows = db.session.execute(
+        text(f"SELECT id FROM {table} TABLESAMPLE SYSTEM (1) REPEATABLE (:seed) LIMIT :n"),
+        {"seed": rng.randrange(1 << 30), "n": count},
+    ).scalars().all()
+    if len(rows) < count:
+        rows = db.session.query(model.id).order_by(model.created_at, model.id).limit(count).all()
+        rows = [row[0] for row in rows]
+    db.session.rollback()
+    return [str(row) for row in rows]
+
+
+# ---------------- CASES ----------------
+class Context:
+    """State shared between cases: seeded ids and rows created by the run"""
+
+    def __init__(self, rng, batch_size):
+        self.rng = rng
+        self.batch_size = batch_size
+        self.ids = {model.__tablename__: sample_ids(model, 200, rng) for model in MODELS}
+        self.pincodes = [
+            row[0] for row in db.session.query(Candidate.pin_code).distinct().limit(50).all()
+        ] or ["560001"]
+        self.districts = [
+            row[0] for row in db.session.query(Candidate.district).distinct().limit(20).all()
+        ] or ["Bangalore"]
+        self.names = [
+            row[0] for row in db.session.query(Candidate.name).distinct().limit(50).all()
+        ] or ["Bench Candidate"]
+        db.session.rollback()
+        self.created = {model.__tablename__: [] for model in MODELS}
+        self.contacts = []
+        self.jobs = []
+
+    def pick(self, table, i):
+        ids = self.ids[table]
+        return ids[i % len(ids)]
+
+    def candidate_payload(self):
+        contact = f"5{self.rng.randrange(10 ** 9):09d}"  # outside the seeded 6-9 range
+        self.contacts.append(contact)
+        return {
+            "name": "Bench Candidate",
+            "contact": contact,
+            "gender": self.rng.choice(("Male", "Female")),
+            "business_type": ["Retail"],
+            "pin_code": self.rng.choice(self.pincodes),
+            "udyam_certificate": False,
+            "phone_type": "Smart Phone",
+            "disability_cat": True,
+        }
+
+    def candidate_sheet(self, rows):
+        """An .xlsx upload for /imports/candidates with rows new candidates"""
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        columns = ["name", "contact", "gender", "business_type", "pin_code",
+                   "udyam_certificate", "phone_type", "disability_cat"]
+        sheet.append(columns)
+        for _ in range(rows):
+            payload = self.candidate_payload()
+            sheet.append([", ".join(v) if isinstance(v, list) else v for v in (payload[c] for c in columns)])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    def attendance_payload(self, i):
+        return {
+            "candidate_id": self.pick("candidates", i),
+            "session_name": ["Digital Marketing"],
+            "attended": True,
+            "date": "2025-01-15",
+            "remarks": "bench",
+        }
+
+    def assessment_payload(self, i):
+        return {
+            "candidate_id": self.pick("candidates", i),
+            "training": "Digital Marketing",
+            "date": "2025-01-15",
+            "status": "Pass",
+            "mark": 70,
+            "remarks": "bench",
+        }
+
+    def business_payload(self, i):
+        return {
+            "candidate_id": self.pick("candidates", i),
+            "customers_before": 10,
+            "customers_after": 20,
+            "income_before": 1000.0,
+            "income_after": 1500.0,
+        }
+
+
+def remember(ctx, table):
+    """Response hook storing the ids a create call returned"""
+    def hook(body):
+        if "id" in body:
+            ctx.created[table].append(body["id"])
+        for result in body.get("results", []):
+            if result.get("status") == "created":
+                ctx.created[table].append(result["id"])
+    return hook
+
+
+def created(ctx, table, i):
+    ids = ctx.created[table]
+    return ids[i % len(ids)]
+
+
+# ---------------- SENDERS ----------------
+# Each makes one timed request and returns (status code, response bytes, body if keep else None)
+
+def send_json(client, method, path, body, keep):
+    response = client.open(path, method=method, json=body)
+    # Drain streamed bodies (exports) so their full cost is measured;
+    # only keep them when a hook needs to read the response
+    size, chunks = 0, []
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+        if keep:
+            chunks.append(chunk)
+    response.close()
+    return response.status_code, size, b"".join(chunks) if keep else None
+
+
+def first_event(client, method, path, body, keep):
+    """Server-sent events: wait for the first event, then hang up"""
+    response = client.open(path, method=method)
+    first = next(response.iter_encoded(), b"")
+    response.close()  # runs the stream's cleanup (unsubscribe)
+    return response.status_code, len(first), first if keep else None
+
+
+def upload_and_wait(client, method, path, body, keep, timeout=300):
+    """Upload a spreadsheet and poll its job until it finishes; a failed job counts as an error"""
+    response = client.open(path, method=method, data={"file": (io.BytesIO(body), UPLOAD_NAME)})
+    if response.status_code != 202:
+        return response.status_code, len(response.data), response.data if keep else None
+    status_url = response.get_json()["status_url"]
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(status_url).get_json()
+        if job["status"] in ("completed", "failed") or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+    data = json.dumps(job).encode()
+    return 200 if job["status"] == "completed" else 500, len(data), data if keep else None
+
+
+def remember_job(ctx):
+    def hook(body):
+        ctx.jobs.append(body["id"])
+    return hook
+
+
+def build_cases(ctx, args):
+    """
+    (group, name, method, request(i) -> (path, body), iterations, hook[, sender])
+    in run order: reads first, then creates, updates and deletes of the run's
+    own rows. body is sent as JSON unless the case names another sender.
+    """
+    day_from, day_to = "2024-06-01", "2024-06-30"
+    year = "date_from=2024-07-01&date_to=2025-06-30"  # one program year of the seeded dates
+    n, heavy = args.iterations, args.export_iterations
+    batch = args.batch_size
+
+    def fixed(path):
+        return lambda i: (path, None)
+
+    cases = [
+        # --- reads ---
+        ("candidates", "candidates get-all", "GET", fixed("/api/v1/candidates/get-all?limit=100"), n, None),
+        ("candidates", "candidates get-all district", "GET",
+         lambda i: (f"/api/v1/candidates/get-all?limit=100&district={ctx.districts[i % len(ctx.districts)]}", None), n, None),
+        ("candidates", "candidates get", "GET", lambda i: (f"/api/v1/candidates/get/{ctx.pick('candidates', i)}", None), n, None),
+        ("candidates", "candidates export", "GET", fixed("/api/v1/candidates/export?format=ndjson"), heavy, None),
+        ("candidates", "candidates full", "GET",
+         lambda i: (f"/api/v1/candidates/{ctx.pick('candidates', i)}/full", None), n, None),
+        ("candidates", "candidates full page", "GET", fixed("/api/v1/candidates/full?limit=100"), n, None),
+        ("candidates", "candidates search", "GET",
+         lambda i: (f"/api/v1/candidates/search?name={ctx.names[i % len(ctx.names)]}", None), n, None),
+        ("candidates", "candidates search batch", "POST",
+         lambda i: ("/api/v1/candidates/search/batch",
+                    {"queries": [{"name": ctx.names[(i + k) % len(ctx.names)]} for k in range(batch)], "limit": 1}),
+         heavy, None),
+        ("attendance", "attendance get-all", "GET", fixed("/api/v1/attendance/get-all?limit=100"), n, None),
+        ("attendance", "attendance get-all session", "GET",
+         fixed(f"/api/v1/attendance/get-all?limit=100&session=Digital%20Marketing&date_from={day_from}&date_to={day_to}"), n, None),
+        ("attendance", "attendance get-all candidate", "GET",
+         lambda i: (f"/api/v1/attendance/get-all?candidate_id={ctx.pick('candidates', i)}", None), n, None),
+        ("attendance", "attendance get", "GET", lambda i: (f"/api/v1/attendance/get/{ctx.pick('attendance', i)}", None), n, None),
+        ("attendance", "attendance stats", "GET", fixed("/api/v1/attendance/stats"), n, None),
+        ("attendance", "attendance export month", "GET",
+         fixed(f"/api/v1/attendance/export?format=csv&date_from={day_from}&date_to={day_to}"), heavy, None),
+        ("assessment", "assessment get-all", "GET", fixed("/api/v1/assessment/get-all?limit=100"), n, None),
+        ("assessment", "assessment get", "GET", lambda i: (f"/api/v1/assessment/get/{ctx.pick('assessment', i)}", None), n, None),
+        ("assessment", "assessment export month", "GET",
+         fixed(f"/api/v1/assessment/export?date_from={day_from}&date_to={day_to}&include_candidate=true"), heavy, None),
+        ("business", "business list", "GET", fixed("/api/v1/business?limit=100"), n, None),
+        ("business", "business get", "GET", lambda i: (f"/api/v1/business/{ctx.pick('business', i)}", None), n, None),
+        ("business", "business export", "GET", fixed("/api/v1/business/export"), heavy, None),
+        ("stats", "stats candidates", "GET", fixed("/api/v1/stats/candidates"), n, None),
+        ("stats", "stats attendance", "GET", fixed("/api/v1/stats/attendance"), n, None),
+        ("stats", "stats stream first event", "GET", fixed("/api/v1/stats/stream"), n, None, first_event),
+        ("stats", "stats business", "GET", fixed("/api/v1/stats/business"), n, None),
+        ("stats", "stats business by district", "GET", fixed("/api/v1/stats/business?group_by=district"), n, None),
+        ("stats", "stats business by gender", "GET", fixed("/api/v1/stats/business?group_by=gender"), n, None),
+        ("stats", "stats regions by state", "GET", fixed("/api/v1/stats/regions?level=state"), n, None),
+        ("stats", "stats regions district drill-down", "GET",
+         lambda i: (f"/api/v1/stats/regions?level=taluk&district={ctx.districts[i % len(ctx.districts)]}", None), n, None),
+        ("stats", "stats attendance weekly year", "GET", fixed(f"/api/v1/stats/attendance/series?bucket=week&{year}"), n, None),
+        ("stats", "stats attendance by district", "GET",
+         lambda i: (f"/api/v1/stats/attendance/series?bucket=month&{year}&district={ctx.districts[i % len(ctx.districts)]}", None), n, None),
+        ("stats", "stats assessment distribution", "GET", fixed("/api/v1/stats/assessment"), n, None),
+        ("stats", "stats assessment one training", "GET",
+         fixed("/api/v1/stats/assessment?training=Digital%20Marketing&bins=20"), n, None),
+        ("imports", "imports list", "GET", fixed("/api/v1/imports"), n, None),
+    ]
+
+    if not args.read_only:
+        cases += [
+            # --- creates ---
+            ("candidates", "candidates create", "POST",
+             lambda i: ("/api/v1/candidates/create", ctx.candidate_payload()), n, remember(ctx, "candidates")),
+            ("attendance", "attendance create", "POST",
+             lambda i: ("/api/v1/attendance/create", ctx.attendance_payload(i)), n, remember(ctx, "attendance")),
+            ("attendance", "attendance create-batch", "POST",
+             lambda i: ("/api/v1/attendance/create-batch", [ctx.attendance_payload(i + k) for k in range(batch)]),
+             heavy, remember(ctx, "attendance")),
+            ("assessment", "assessment create", "POST",
+             lambda i: ("/api/v1/assessment/create", ctx.assessment_payload(i)), n, remember(ctx, "assessment")),
+            ("assessment", "assessment create-batch", "POST",
+             lambda i: ("/api/v1/assessment/create-batch", [ctx.assessment_payload(i + k) for k in range(batch)]),
+             heavy, remember(ctx, "assessment")),
+            ("business", "business create", "POST",
+             lambda i: ("/api/v1/business", ctx.business_payload(i)), n, remember(ctx, "business")),
+            ("business", "business create-batch", "POST",
+             lambda i: ("/api/v1/business/create-batch", [ctx.business_payload(i + k) for k in range(batch)]),
+             heavy, remember(ctx, "business")),
+            ("imports", "imports candidates", "POST",
+             lambda i: ("/api/v1/imports/candidates", ctx.candidate_sheet(batch)), heavy, remember_job(ctx),
+             upload_and_wait),
+            ("imports", "imports get", "GET", lambda i: (f"/api/v1/imports/{ctx.jobs[i % len(ctx.jobs)]}", None),
+             n, None),
+            # --- updates of the run's own rows ---
+            ("candidates", "candidates update", "PUT",
+             lambda i: (f"/api/v1/candidates/update/{created(ctx, 'candidates', i)}",
+                        {**ctx.candidate_payload(), "contact": ctx.contacts[i % len(ctx.contacts)]}), n, None),
+            ("candidates", "candidates update-all", "PUT",
+             lambda i: ("/api/v1/candidates/update-all",
+                        [{**ctx.candidate_payload(), "contact": c} for c in ctx.contacts[:batch]]), heavy, None),
+            ("attendance", "attendance update", "PUT",
+             lambda i: (f"/api/v1/attendance/update/{created(ctx, 'attendance', i)}", ctx.attendance_payload(i)), n, None),
+            ("attendance", "attendance update-all", "PUT",
+             lambda i: ("/api/v1/attendance/update-all",
+                        [{**ctx.attendance_payload(k), "id": created(ctx, "attendance", k)} for k in range(batch)]),
+             heavy, None),
+            ("assessment", "assessment update", "PUT",
+             lambda i: (f"/api/v1/assessment/update/{created(ctx, 'assessment', i)}", ctx.assessment_payload(i)), n, None),
+            ("assessment", "assessment update-all", "PUT",
+             lambda i: ("/api/v1/assessment/update-all",
+                        [{**ctx.assessment_payload(k), "id": created(ctx, "assessment", k)} for k in range(batch)]),
+             heavy, None),
+            ("business", "business update", "PUT",
+             lambda i: (f"/api/v1/business/{created(ctx, 'business', i)}", ctx.business_payload(i)), n, None),
+            ("business", "business update-all", "PUT",
+             lambda i: ("/api/v1/business",
+                        [{**ctx.business_payload(k), "id": created(ctx, "business", k)} for k in range(batch)]),
+             heavy, None),
+            # --- deletes of the run's own rows (children before candidates) ---
+            ("attendance", "attendance delete", "DELETE",
+             lambda i: (f"/api/v1/attendance/delete/{ctx.created['attendance'].pop()}", None), n, None),
+            ("assessment", "assessment delete", "DELETE",
+             lambda i: (f"/api/v1/assessment/delete/{ctx.created['assessment'].pop()}", None), n, None),
+            ("business", "business delete", "DELETE",
+             lambda i: (f"/api/v1/business/{ctx.created['business'].pop()}", None), n, None),
+            ("candidates", "candidates delete", "DELETE",
+             lambda i: (f"/api/v1/candidates/delete/{ctx.created['candidates'].pop()}", None), n, None),
+        ]
+
+    if args.destructive:
+        cases += [
+            ("attendance", "attendance delete-all", "DELETE", fixed("/api/v1/attendance/delete-all"), 1, None),
+            ("assessment", "assessment delete-all", "DELETE", fixed("/api/v1/assessment/delete-all"), 1, None),
+            ("business", "business delete-all", "DELETE", fixed("/api/v1/business"), 1, None),
+            ("candidates", "candidates delete-all", "DELETE", fixed("/api/v1/candidates/delete-all"), 1, None),
+        ]
+
+    if args.only:
+        cases = [case for case in cases if case[0] in args.only or case[1] in args.only]
+    return cases
+
+
+def run_case(client, method, make_request, iterations, warmup, hook, send=send_json):
+    latencies, errors, status_codes = [], 0, {}
+    for i in range(-warmup, iterations):
+        path, body = make_request(i if i >= 0 else iterations - i)
+        start = time.perf_counter()
+        status_code, size, data = send(client, method, path, body, keep=hook is not None)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if status_code >= 400:
+            errors += 1
+        elif hook:
+            hook(json.loads(data))
+        if i >= 0:
+            latencies.append(elapsed)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+    latencies.sort()
+    total = sum(latencies)
+
+    def ms(value):
+        return None if value is None else round(value, 3)
+
+    return {
+        "iterations": len(latencies),
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "last_response_bytes": size,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "mean_ms": ms(total / len(latencies)) if latencies else None,
+        "throughput_rps": round(len(latencies) / (total / 1000), 2) if total else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def cleanup(ctx):
+    """Remove whatever the run created that a delete case did not"""
+    for model in (Attendance, Assessment, Business, Candidate):
+        ids = [uuid.UUID(i) for i in ctx.created[model.__tablename__]]
+        if ids:
+            db.session.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+    if ctx.contacts:
+        stray = db.session.query(Candidate.id).filter(Candidate.contact.in_(ctx.contacts))
+        for model in (Attendance, Assessment, Business):
+            db.session.query(model).filter(model.candidate_id.in_(stray.scalar_subquery())).delete(
+                synchronize_session=False
+            )
+        db.session.query(Candidate).filter(Candidate.contact.in_(ctx.contacts)).delete(synchronize_session=False)
+    db.session.query(ImportJob).filter(ImportJob.filename == UPLOAD_NAME).delete(synchronize_session=False)
+    db.session.commit()
+
+
+# ---------------- MAIN ----------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="timed requests per endpoint")
+    parser.add_argument("--export-iterations", type=int, default=3,
+                        help="timed requests for exports and batch endpoints")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed requests per endpoint")
+    parser.add_argument("--batch-size", type=int, default=100, help="records per batch request")
+    parser.add_argument("--stats-cache-ttl", type=int, default=0,
+                        help="STATS_CACHE_TTL for the run; 0 measures the aggregate queries every time")
+    parser.add_argument("--only", nargs="+", help="case names or groups (candidates, attendance, ..., stats, imports)")
+    parser.add_argument("--read-only", action="store_true", help="skip create/update/delete endpoints")
+    parser.add_argument("--destructive", action="store_true", help="finish with the delete-all endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["STATS_CACHE_TTL"] = args.stats_cache_ttl
+    client = app.test_client()
+    rng = random.Random(args.seed)
+
+    with app.app_context():
+        rows = {model.__tablename__: db.session.query(model).count() for model in MODELS}
+        ctx = Context(rng, args.batch_size)
+        db.session.remove()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rows": rows,
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    try:
+        for group, name, method, make_request, iterations, hook, *send in build_cases(ctx, args):
+            result = run_case(client, method, make_request, iterations, args.warmup, hook, *send)
+            report["results"][name] = {"group": group, "method": method, **result}
+            print(f"{name:<32}{result['p50_ms'] or 0:>9.2f}{result['p95_ms'] or 0:>9.2f}"
+                  f"{result['p99_ms'] or 0:>9.2f} ms{result['errors']:>5} err", file=sys.stderr)
+    finally:
+        with app.app_context():
+            cleanup(ctx)
+
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
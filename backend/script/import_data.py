@@ -0,0 +1,500 @@
+"""
+Import candidates, attendance, assessment or business rows from Excel
+through the HTTP API.
+
+    python script/import_data.py candidates script/candidates_input.xlsx
+    python script/import_data.py attendance script/attendance_data.xlsx --workers 8
+    python script/import_data.py business script/business_data.xlsx --api http://localhost:5000/api/v1
+
+- Candidate names are resolved once, up front, into a normalized-name dict
+  using the batch search endpoint.
+- Rows go out on one pooled requests.Session from --workers threads.
+  Attendance, assessment and business rows are sent --batch-size at a time
+  to the /create-batch endpoints; candidates are created one per request.
+- Connection failures and 429/502/503 responses are retried with
+  exponential backoff. Requests that may already have reached the database
+  (read timeouts, 500, 504) are not retried automatically.
+- Candidate pincodes come from the offline pincode index, reversed from
+  (state, district, taluk). Each distinct place is resolved once; places
+  the index cannot place at taluk level are kept in a JSON cache
+  (--pincode-cache) and, with --geocode-online, asked of Nominatim once.
+  Anything still unknown gets a pincode from the same district; those
+  places are listed, and their rows are marked "pincode": "district" in
+  the checkpoint.
+- Every finished row is appended to a checkpoint file next to the sheet
+  (<sheet>.checkpoint.jsonl). Running the same command again skips those
+  rows, so an interrupted import resumes where it stopped. Use --restart to
+  ignore the checkpoint.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # app.helpers.pincode
+
+DEFAULT_API = os.environ.get("MSME_API_URL", "https://msme.winvinayafoundation.org/api/v1")
+SEARCH_CHUNK = 1000  # names per batch search request
+DEFAULT_PINCODE_CACHE = os.environ.get(
+    "PINCODE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "pincode_cache.json")
+)
+
+KINDS = {
+    # kind: (endpoint under the API root, rows per request)
+    "candidates": ("candidates/create", 1),
+    "attendance": ("attendance/create-batch", None),
+    "assessment": ("assessment/create-batch", None),
+    "business": ("business/create-batch", None),
+}
+
+
+# ---------------- CELL VALUES ----------------
+def safe_value(val, default=None):
+    """Convert NaN/None to safe default"""
+    if val is None or (isinstance(val, float) and math.isnan(val)):
+        return default
+    return val
+
+
+def safe_int(val):
+    try:
+        return int(float(val))
+    except (ValueError, TypeError):
+        return None
+
+
+def safe_float(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def str_to_bool(value) -> bool:
+    return str(value).strip().upper() in ("TRUE", "YES", "1")
+
+
+def format_date(date_str):
+    """Convert Excel date string to YYYY-MM-DD"""
+    try:
+        if not date_str:
+            return None
+        return pd.to_datetime(date_str, dayfirst=True).strftime("%Y-%m-%d")
+    except Exception:
+        return None
+
+
+def normalize_name(name) -> str:
+    """Case and whitespace insensitive key: '  Ravi  KUMAR ' -> 'ravi kumar'"""
+    return " ".join(str(name or "").split()).casefold()
+
+
+# ---------------- HTTP ----------------
+def make_session(workers, retries, backoff):
+    """One keep-alive connection per worker, retried with exponential backoff"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,                       # the server may already have written the rows
+        status=retries,
+        status_forcelist=(429, 502, 503),
+        allowed_methods=None,         # POST included: these statuses mean the request was not handled
+        backoff_factor=backoff,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def resolve_candidate_ids(session, api, names, workers, timeout):
+    """
+    {normalized name: candidate id} for every distinct name, built once.
+    Only exact (normalized) matches count.
+    """
+    distinct = list(dict.fromkeys(n for n in (normalize_name(n) for n in names) if n))
+    chunks = [distinct[i:i + SEARCH_CHUNK] for i in range(0, len(distinct), SEARCH_CHUNK)]
+
+    def lookup(chunk):
+        res = session.post(
+            f"{api}/candidates/search/batch",
+            json={"queries": [{"name": n} for n in chunk], "limit": 3},
+            timeout=timeout,
+        )
+        res.raise_for_status()
+        found = {}
+        for name, result in zip(chunk, res.json()["results"]):
+            match = next((m for m in result["matches"] if normalize_name(m["name"]) == name), None)
+            if match:
+                found[name] = match["id"]
+        return found
+
+    ids = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for found in pool.map(lookup, chunks):
+            ids.update(found)
+    return ids
+
+
+# ---------------- PINCODES ----------------
+class PincodeCache:
+    """
+    {"state|district|taluk": pincode or null} on disk, for places the offline
+    index could not place at taluk level. Misses are cached too, so the
+    remote geocoder is asked about each place at most once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def _key(place):
+        return "|".join(normalize_name(part) for part in place)
+
+    def __contains__(self, place):
+        return self._key(place) in self.entries
+
+    def get(self, place):
+        return self.entries.get(self._key(place))
+
+    def set(self, place, pincode):
+        self.entries[self._key(place)] = pincode
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=0, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def _geocode_online(geocode, state, district, taluk):
+    """Remote Nominatim: taluk first, then the district"""
+    for query in (f"{taluk}, {district}, {state}, India", f"{district}, {state}, India"):
+        location = geocode(query, addressdetails=True)
+        if location and "postcode" in location.raw['address']:
+            return location.raw['address']['postcode']
+    return None
+
+
+def resolve_pincodes(places, cache_path, online=False):
+    """
+    ({(state, district, taluk): pincode or None}, {places given a district pincode}),
+    each distinct place resolved once: offline index at taluk level, then the
+    on-disk cache, then (with online) the remote geocoder, and finally any
+    pincode in the same district.
+    """
+    from app.helpers.pincode import get_pincode_index
+
+    index = get_pincode_index()  # the offline snapshot (flask pincode-snapshot)
+    cache = PincodeCache(cache_path)
+    places = list(dict.fromkeys(places))
+    result, unresolved = {}, []
+    for place in places:
+        pincode = index.reverse_lookup(*place, district_fallback=False) or cache.get(place)
+        if pincode:
+            result[place] = pincode
+        elif online and place not in cache:
+            unresolved.append(place)
+
+    if unresolved:
+        from geopy.geocoders import Nominatim
+        from geopy.extra.rate_limiter import RateLimiter
+
+        geolocator = Nominatim(user_agent="candidate_pincode_lookup")
+        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)  # Nominatim usage policy
+        print(f"Geocoding {len(unresolved)} places online (about {len(unresolved)}-{2 * len(unresolved)}s)")
+        for place in unresolved:
+            try:
+                pincode = _geocode_online(geocode, *place)
+            except Exception as e:
+                print(f"⚠️ Geocode error for {'/'.join(place)}: {e}")
+                continue  # not cached: retried on the next run
+            cache.set(place, pincode)
+            cache.save()
+            if pincode:
+                result[place] = pincode
+
+    by_district = set()
+    for place in places:
+        if place not in result:
+            result[place] = index.reverse_lookup(*place)
+            if result[place]:
+                by_district.add(place)
+    return result, by_district
+
+
+# ---------------- ROW BUILDERS ----------------
+# Each takes (row, lookups) and returns (payload, None) or (None, reason the row was skipped).
+# lookups is {normalized name: candidate id}, or {place: pincode} for candidates.
+
+def location_key(row):
+    return tuple(safe_value(row.get(c), "").strip() for c in ("State", "District", "Taluk"))
+
+
+def candidate_payload(row, pincodes):
+    state, district, taluk = key = location_key(row)
+    pin_code = pincodes.get(key)
+    if pin_code is None:
+        return None, f"Could not find pincode for {state}/{district}/{taluk}"
+
+    business_type = safe_value(row.get("Business Type"), "")
+    return {
+        "name": safe_value(row.get("name"), "").strip(),
+        "contact": safe_value(row.get("contact"), "").strip(),
+        "gender": safe_value(row.get("gender")),
+        "business_type": [v.strip() for v in business_type.split(",") if v.strip()],
+        "pin_code": pin_code,
+        "udyam_certificate": str_to_bool(safe_value(row.get("Udyam_Certificate"), "")),
+        "phone_type": safe_value(row.get("phone_model")),
+        "disability_cat": str_to_bool(safe_value(row.get("disabled"), "")),
+    }, None
+
+
+def _with_candidate(build):
+    def payload(row, ids):
+        name = safe_value(row.get("name"), "")
+        candidate_id = ids.get(normalize_name(name))
+        if not candidate_id:
+            return None, f"Candidate '{name.strip()}' not found"
+        return {"candidate_id": candidate_id, **build(row)}, None
+    return payload
+
+
+BUILDERS = {
+    "candidates": candidate_payload,
+    "attendance": _with_candidate(lambda row: {
+        "session_name": [s] if (s := safe_value(row.get("sessionname"))) else [],
+        "attended": str_to_bool(safe_value(row.get("attended"), "FALSE")),
+        "date": format_date(safe_value(row.get("date"))),
+        "remarks": safe_value(row.get("remarks"), ""),
+    }),
+    "assessment": _with_candidate(lambda row: {
+        "training": safe_value(row.get("training")),
+        "date": format_date(safe_value(row.get("date"))),
+        "status": safe_value(row.get("status")),
+        "mark": safe_float(safe_value(row.get("mark"))),
+        "remarks": safe_value(row.get("remarks"), ""),
+    }),
+    "business": _with_candidate(lambda row: {
+        "customers_before": safe_int(safe_value(row.get("totalcustomersbefore"))),
+        "customers_after": safe_int(safe_value(row.get("totalcustomersafter"))),
+        "income_before": safe_float(safe_value(row.get("incomebefore"))),
+        "income_after": safe_float(safe_value(row.get("incomeafter"))),
+    }),
+}
+
+
+# ---------------- CHECKPOINT ----------------
+def file_fingerprint(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines: a header naming the kind and sheet hash, then one
+    line per finished row ({"row", "status", "error"?, "pincode"?}). Rows that failed on
+    the network are not recorded, so a rerun tries them again.
+    """
+
+    def __init__(self, path, kind, fingerprint, restart=False):
+        self.path = path
+        self.done = {}
+        header = {"kind": kind, "sha256": fingerprint}
+        if os.path.exists(path) and not restart:
+            with open(path) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            if lines and lines[0] != header:
+                raise SystemExit(
+                    f"{path} belongs to a different sheet or kind; pass --restart to start over"
+                )
+            self.done = {entry["row"]: entry["status"] for entry in lines[1:]}
+            self.file = open(path, "a")
+        else:
+            self.file = open(path, "w")
+            self._write(header)
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+
+    def record(self, row, status, error=None, **notes):
+        self.done[row] = status
+        self._write({"row": row, "status": status, **({"error": error} if error else {}), **notes})
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+# ---------------- SENDING ----------------
+def send(session, url, rows, timeout):
+    """
+    POST one request for [(sheet row, payload)].
+    Returns [(sheet row, "created" | "failed", error or None)]; raises on
+    network errors so those rows stay pending.
+    """
+    batch = len(rows) > 1 or url.endswith("/create-batch")
+    body = [payload for _, payload in rows] if batch else rows[0][1]
+    res = session.post(url, json=body, timeout=timeout)
+
+    if res.status_code >= 500 or res.status_code == 429:
+        raise requests.HTTPError(f"{res.status_code} {res.text[:200]}", response=res)
+    if not batch:
+        ok = res.status_code in (200, 201)
+        return [(rows[0][0], "created" if ok else "failed", None if ok else f"{res.status_code} {res.text[:200]}")]
+
+    data = res.json()
+    if "results" not in data:  # the whole batch was rejected
+        return [(row, "failed", data.get("error", res.text[:200])) for row, _ in rows]
+    outcomes = []
+    for result in data["results"]:
+        row = rows[result["index"]][0]
+        if result["status"] == "created":
+            outcomes.append((row, "created", None))
+        else:
+            outcomes.append((row, "failed", result.get("error") or json.dumps(result.get("validation_errors"))))
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("excel_file")
+    parser.add_argument("--api", default=DEFAULT_API, help="API root, e.g. http://localhost:5000/api/v1")
+    parser.add_argument("--workers", type=int, default=4, help="requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=200, help="rows per /create-batch request")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--backoff", type=float, default=0.5, help="seconds; doubles on each retry")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--checkpoint", help="default: <excel_file>.checkpoint.jsonl")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--pincode-cache", default=DEFAULT_PINCODE_CACHE,
+                        help="places resolved outside the offline index (candidates)")
+    parser.add_argument("--geocode-online", action="store_true",
+                        help="ask Nominatim (geopy) about places missing from the offline index")
+    args = parser.parse_args(argv)
+
+    try:
+        df = pd.read_excel(args.excel_file, dtype=str)
+    except Exception as e:
+        print(f"❌ Failed to read Excel file: {e}")
+        return 1
+    df.columns = df.columns.str.strip()  # Remove extra spaces from headers
+
+    checkpoint = Checkpoint(
+        args.checkpoint or f"{args.excel_file}.checkpoint.jsonl",
+        args.kind, file_fingerprint(args.excel_file), restart=args.restart,
+    )
+    # Excel row numbers: header is row 1
+    pending = [(index + 2, row) for index, row in zip(range(len(df)), df.to_dict("records"))
+               if index + 2 not in checkpoint.done]
+    print(f"{len(df)} rows, {len(df) - len(pending)} already done, {len(pending)} to send")
+
+    session = make_session(args.workers, args.retries, args.backoff)
+    notes = {}  # sheet row -> extra checkpoint fields
+    if args.kind == "candidates":
+        start = time.perf_counter()
+        lookups, by_district = resolve_pincodes(
+            (location_key(row) for _, row in pending), args.pincode_cache, online=args.geocode_online
+        )
+        print(f"Resolved {len(lookups)} distinct places in {time.perf_counter() - start:.1f}s")
+        if by_district:
+            print(f"⚠️ {len(by_district)} places matched only by district; their rows get a district pincode:")
+            for place in sorted(by_district):
+                print(f"   {'/'.join(place)} -> {lookups[place]}")
+            notes = {row_number: {"pincode": "district"}
+                     for row_number, row in pending if location_key(row) in by_district}
+    else:
+        try:
+            lookups = resolve_candidate_ids(
+                session, args.api, (row.get("name") for _, row in pending), args.workers, args.timeout
+            )
+        except Exception as e:
+            print(f"❌ Failed to resolve candidates: {e}")
+            checkpoint.close()
+            return 1
+
+    build = BUILDERS[args.kind]
+    ready = []
+    for row_number, row in pending:
+        payload, skipped = build(row, lookups)
+        if skipped:
+            print(f"⚠️ Row {row_number}: {skipped}. Skipping.")
+            checkpoint.record(row_number, "skipped", skipped)
+        else:
+            ready.append((row_number, payload))
+    checkpoint.flush()
+
+    endpoint, per_request = KINDS[args.kind]
+    size = per_request or max(1, args.batch_size)
+    url = f"{args.api}/{endpoint}"
+    requests_to_send = [ready[i:i + size] for i in range(0, len(ready), size)]
+
+    counts = {"created": 0, "failed": 0, "pending": 0, "district": 0}
+    reported = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(send, session, url, rows, args.timeout): rows for rows in requests_to_send}
+        try:
+            for future in as_completed(futures):
+                rows = futures[future]
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    counts["pending"] += len(rows)
+                    print(f"❌ Rows {rows[0][0]}-{rows[-1][0]} not sent, will retry on the next run: {e}")
+                    continue
+                for row_number, status, error in outcomes:
+                    counts[status] += 1
+                    checkpoint.record(row_number, status, error, **notes.get(row_number, {}))
+                    counts["district"] += row_number in notes
+                    if error:
+                        print(f"❌ Row {row_number}: {error}")
+                checkpoint.flush()
+                done = counts["created"] + counts["failed"]
+                if done - reported >= 1000:
+                    reported = done
+                    print(f"... {done}/{len(ready)} rows, {done / (time.perf_counter() - start):.0f} rows/s")
+        except KeyboardInterrupt:
+            print("Interrupted; finished rows are saved in the checkpoint")
+            for future in futures:
+                future.cancel()
+            checkpoint.close()
+            raise
+
+    checkpoint.close()
+    print(
+        f"✅ {counts['created']} created, {counts['failed']} rejected, {counts['pending']} pending "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    if counts["district"]:
+        print(f"⚠️ {counts['district']} rows sent with a district pincode (\"pincode\": \"district\" in {checkpoint.path})")
+    return 1 if counts["pending"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
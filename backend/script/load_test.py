@@ -0,0 +1,177 @@
+"""
+Local load test: dev server vs. the gunicorn production profile.
+
+Starts each server in turn on a free port, drives it with concurrent
+keep-alive clients for a fixed duration and prints requests/sec and latency
+percentiles. The database in DATABASE_URL (or the Config default) must be
+reachable; read-only GET endpoints are used, so any data set works.
+
+    cd backend
+    python script/load_test.py                       # dev server, then 1..N workers
+    python script/load_test.py --workers 1 2 4 8 --duration 20
+    python script/load_test.py --path /api/v1/stats/candidates
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import Thread
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = [
+    "/api/v1/candidates/get-all?limit=50",
+    "/api/v1/attendance/get-all?limit=50",
+    "/api/v1/stats/candidates",
+]
+
+
+# ---------------- SERVERS ----------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, port, workers=1, threads=4):
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    if kind == "dev":
+        cmd = [sys.executable, "-m", "flask", "--app", "main", "run", "--port", str(port), "--with-threads"]
+    else:
+        env.update(
+            BIND=f"127.0.0.1:{port}",
+            WEB_CONCURRENCY=str(workers),
+            WEB_THREADS=str(threads),
+            GUNICORN_ACCESS_LOG="",
+            LOG_LEVEL="warning",
+        )
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]
+    proc = subprocess.Popen(
+        cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{kind} server exited with code {proc.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}{DEFAULT_PATHS[-1]}", timeout=2)
+            return proc
+        except requests.RequestException:
+            time.sleep(0.5)
+    stop_server(proc)
+    raise RuntimeError(f"{kind} server did not come up on port {port}")
+
+
+def stop_server(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+# ---------------- CLIENT ----------------
+def client_process(base_url, paths, duration, connections):
+    """Run `connections` keep-alive clients in one process; returns latencies in ms"""
+    latencies, errors = [], [0]
+    stop_at = time.time() + duration
+
+    def loop(offset):
+        session = requests.Session()
+        i = offset
+        while time.time() < stop_at:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                res = session.get(url, timeout=30)
+                ok = res.status_code == 200
+            except requests.RequestException:
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors[0] += 1
+
+    threads = [Thread(target=loop, args=(n,)) for n in range(connections)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors[0]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_load(base_url, paths, duration, clients, client_procs):
+    per_proc = max(1, clients // client_procs)
+    with ProcessPoolExecutor(client_procs) as pool:
+        futures = [
+            pool.submit(client_process, base_url, paths, duration, per_proc)
+            for _ in range(client_procs)
+        ]
+        latencies, errors = [], 0
+        for f in futures:
+            lat, err = f.result()
+            latencies.extend(lat)
+            errors += err
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+# ---------------- MAIN ----------------
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, max(1, cores // 2), cores})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers,
+                        help="gunicorn worker counts to test (default: 1, cores/2, cores)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per gunicorn worker")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--client-procs", type=int, default=max(1, cores // 2),
+                        help="processes the clients are spread over")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per run")
+    parser.add_argument("--path", action="append", dest="paths", help="GET path to hit (repeatable)")
+    parser.add_argument("--skip-dev", action="store_true", help="skip the Werkzeug dev server run")
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    runs = [] if args.skip_dev else [("dev server", "dev", 1)]
+    runs += [(f"gunicorn {w}x{args.threads}", "gunicorn", w) for w in args.workers]
+
+    print(f"{cores} cores, {args.clients} clients, {args.duration:g}s per run")
+    print(f"{'server':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for label, kind, workers in runs:
+        port = free_port()
+        proc = start_server(kind, port, workers=workers, threads=args.threads)
+        try:
+            stats = run_load(f"http://127.0.0.1:{port}", paths, args.duration, args.clients, args.client_procs)
+        finally:
+            stop_server(proc)
+        print(f"{label:<18}{stats['rps']:>10.1f}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+              f"{stats['p99']:>10.1f}{stats['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
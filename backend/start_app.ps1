@@ -27,7 +27,10 @@ $env:FLASK_APP = "main.py"
 
 flask db init
 flask db migrate -m "Initial migration"
+flask pincode-snapshot --if-missing
+flask ensure-extensions
 flask db upgrade
+flask rebuild-summaries
 
 Write-Host "Setup complete. To run the app:"
 Write-Host "  .\$venv\Scripts\Activate.ps1"
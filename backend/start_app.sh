@@ -40,7 +40,10 @@ export FLASK_APP=main.py
 
 flask db init
 flask db migrate -m "Initial migration"
+flask pincode-snapshot --if-missing
+flask ensure-extensions
 flask db upgrade
+flask rebuild-summaries
 
 echo "Setup complete. To run the app:"
 echo "  source $VENV_DIR/bin/activate"
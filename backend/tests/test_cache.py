@@ -0,0 +1,43 @@
+import threading
+import time
+
+from app.helpers.cache import TTLCache
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = TTLCache(max_entries=3)
+    for key in "abc":
+        cache.get_or_compute(key, 60, lambda key=key: key.upper())
+    cache.get("a")
+
+    cache.get_or_compute("d", 60, lambda: "D")
+
+    assert list(cache._data) == ["c", "a", "d"]
+
+
+def test_expired_entries_are_purged_on_insert():
+    cache = TTLCache(max_entries=10)
+    cache.get_or_compute("old", 0.01, lambda: 1)
+    time.sleep(0.02)
+
+    cache.get_or_compute("new", 60, lambda: 2)
+
+    assert list(cache._data) == ["new"]
+
+
+def test_concurrent_misses_compute_once_and_leave_no_key_locks():
+    cache, calls = TTLCache(), []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    threads = [threading.Thread(target=cache.get_or_compute, args=("key", 60, compute)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache._key_locks == {}
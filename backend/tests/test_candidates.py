@@ -0,0 +1,59 @@
+import uuid
+
+from sqlalchemy.exc import IntegrityError
+
+from app.helpers.utils import violated_constraint
+
+
+def test_duplicate_contact_is_rejected_on_create(client, make_candidate):
+    make_candidate(1)
+
+    response = client.post("/api/v1/candidates/create", json={
+        "name": "Someone Else", "contact": "9000000001", "gender": "Female", "business_type": [],
+        "pin_code": "570001", "udyam_certificate": True, "phone_type": "Basic Phone", "disability_cat": False,
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Contact already registered"}
+    assert len(client.get("/api/v1/candidates/get-all").get_json()["items"]) == 1
+
+
+def test_duplicate_contact_is_rejected_on_update(client, make_candidate):
+    make_candidate(1)
+    second = make_candidate(2)
+
+    response = client.put(f"/api/v1/candidates/update/{second}", json={
+        "name": "Candidate 2", "contact": "9000000001", "gender": "Male", "business_type": ["Retail"],
+        "pin_code": "560001", "udyam_certificate": False, "phone_type": "Smart Phone", "disability_cat": False,
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Contact already registered"}
+
+
+def test_unknown_candidate_is_not_reported_as_duplicate_contact(client):
+    response = client.post("/api/v1/attendance/create", json={
+        "candidate_id": str(uuid.uuid4()), "session_name": ["Bookkeeping"], "attended": True,
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid Candidate ID"}
+
+
+def test_violated_constraint_names_the_index(app, client, make_candidate):
+    from app.database import db
+    from app.models.candidates import Candidate
+
+    make_candidate(1)
+    with app.app_context():
+        db.session.add(Candidate(
+            name="Copy", contact="9000000001", gender="Male", state="Karnataka", district="Bangalore",
+            taluk="Bangalore GPO", pin_code="560001", phone_type="Smart Phone",
+        ))
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            assert violated_constraint(e) == "ux_candidates_contact"
+        else:
+            raise AssertionError("duplicate contact was committed")
@@ -0,0 +1,48 @@
+def _ids(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return {item["id"] for item in response.get_json()["items"]}
+
+
+def test_candidates_filter_by_district_and_gender(client, make_candidate):
+    bangalore_male = make_candidate(1)
+    bangalore_female = make_candidate(2, gender="Female")
+    chennai_male = make_candidate(3, pin_code="600001")
+
+    assert _ids(client, "/api/v1/candidates/get-all?district=Bangalore") == {bangalore_male, bangalore_female}
+    assert _ids(client, "/api/v1/candidates/get-all?gender=Male") == {bangalore_male, chennai_male}
+    assert _ids(client, "/api/v1/candidates/get-all?district=Bangalore&gender=Female") == {bangalore_female}
+
+
+def test_attendance_filters_by_session_date_range_and_candidate(client, make_candidate):
+    first, second = make_candidate(1), make_candidate(2)
+    records = {}
+    for key, candidate_id, sessions, day in (
+        ("early", first, ["Bookkeeping"], "2025-01-05"),
+        ("late", first, ["Bookkeeping", "Digital Marketing"], "2025-02-05"),
+        ("other", second, ["Digital Marketing"], "2025-01-20"),
+    ):
+        response = client.post("/api/v1/attendance/create", json={
+            "candidate_id": candidate_id, "session_name": sessions, "attended": True, "date": day,
+        })
+        assert response.status_code == 201, response.get_json()
+        records[key] = response.get_json()["id"]
+
+    url = "/api/v1/attendance/get-all?limit=100"
+    assert _ids(client, f"{url}&session=Bookkeeping") == {records["early"], records["late"]}
+    assert _ids(client, f"{url}&date_from=2025-01-10&date_to=2025-01-31") == {records["other"]}
+    assert _ids(client, f"{url}&session=Digital Marketing&candidate_id={first}") == {records["late"]}
+    # District comes from the candidate, through a join
+    assert len(_ids(client, f"{url}&district=Bangalore")) == 3
+    assert _ids(client, f"{url}&district=Chennai") == set()
+
+
+def test_invalid_filter_values_are_bad_requests(client):
+    for query, error in (
+        ("date_from=01-01-2025", "date_from must be in YYYY-MM-DD format"),
+        ("candidate_id=42", "candidate_id must be a valid UUID"),
+        ("order=sideways", "order must be 'asc' or 'desc'"),
+    ):
+        response = client.get(f"/api/v1/attendance/get-all?{query}")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": error}
@@ -0,0 +1,99 @@
+import io
+import time
+import uuid
+
+import openpyxl
+import pytest
+
+from app.database import db
+from app.helpers import ingest
+from app.models.import_job import ImportJob
+
+
+def test_oversized_upload_is_rejected_before_the_body_is_parsed(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "IMPORT_MAX_UPLOAD_MB", 0)
+
+    response = client.post("/api/v1/imports/candidates", data={"file": (io.BytesIO(b"x" * 1024), "a.xlsx")})
+
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "Uploads are limited to 0 MB"}
+
+
+def test_jobs_of_a_stopped_process_are_failed(app, client):
+    with app.app_context():
+        orphan = ImportJob(id=uuid.uuid4(), kind="candidates", status="running", processed_rows=3000, errors=[],
+                           owner=1)  # no live process holds this key
+        live = ImportJob(id=uuid.uuid4(), kind="candidates", status="running", errors=[],
+                         owner=ingest._owner_key())
+        db.session.add_all([orphan, live])
+        db.session.commit()
+        orphan_id, live_id = orphan.id, live.id
+
+    jobs = {job["id"]: job for job in client.get("/api/v1/imports").get_json()}
+
+    assert jobs[str(orphan_id)]["status"] == "failed"
+    assert "after 3000 rows" in jobs[str(orphan_id)]["message"]
+    assert jobs[str(live_id)]["status"] == "running"
+
+
+def test_candidate_import_skips_contacts_already_registered(app, client, make_candidate):
+    make_candidate(1)
+    sheet = {"name": "Imported", "gender": "Female", "pin_code": "600001", "phone_type": "Basic Phone"}
+
+    with app.app_context():
+        inserted, errors = ingest._candidate_rows([
+            (2, {**sheet, "contact": "9000000001"}),  # registered through the API
+            (3, {**sheet, "contact": "9000000002"}),
+            (4, {**sheet, "contact": "9000000002"}),  # repeated in the file
+        ])
+
+    assert inserted == 1
+    assert errors == [
+        {"row": 2, "error": "Contact already registered"},
+        {"row": 4, "error": "Contact already registered"},
+    ]
+
+
+def test_candidate_template_sheet_resolves_pincodes_from_the_place(client):
+    # Headers of script/candidates_input.xlsx: no pincode column, the place instead
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["name", "contact", "gender", "Business Type", "State", "District", "Taluk",
+                  "Udyam_Certificate", "phone_model", "disabled"])
+    sheet.append(["Asha", "9100000001", "Female", "Retail, Dairy", "Karnataka", "Mysore", "Mysore",
+                  "TRUE", "Smart Phone", "FALSE"])
+    sheet.append(["Ravi", "9100000002", "Male", "Retail", " karnataka", "MYSORE ", "mysore",
+                  "FALSE", "Basic Phone", "TRUE"])
+    sheet.append(["Meena", "9100000003", "Female", "Retail", "Karnataka", "Mysore", "Nowhere",
+                  "FALSE", "Basic Phone", "FALSE"])
+    upload = io.BytesIO()
+    workbook.save(upload)
+    upload.seek(0)
+
+    response = client.post("/api/v1/imports/candidates", data={"file": (upload, "candidates_input.xlsx")})
+    assert response.status_code == 202
+    status_url = response.get_json()["status_url"]
+    for _ in range(100):
+        job = client.get(status_url).get_json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.05)
+
+    assert (job["status"], job["inserted"], job["failed"]) == ("completed", 2, 1), job
+    assert job["errors"] == [{"row": 4, "error": "Could not find pincode for Karnataka/Mysore/Nowhere"}]
+    candidates = client.get("/api/v1/candidates/get-all").get_json()["items"]
+    assert {(c["pin_code"], c["district"]) for c in candidates} == {("570001", "Mysore")}
+
+
+def test_unreadable_cells_are_errors_not_passed_through():
+    assert ingest._int(12.0, "customers") == 12
+    assert ingest._float("2500.5", "income") == 2500.5
+    assert ingest._date("05/02/2025", "date") == "2025-02-05"
+    for read, value, message in (
+        (ingest._int, "twelve", "customers: 'twelve' is not a number"),
+        (ingest._int, 2.5, "customers: '2.5' is not a whole number"),
+        (ingest._float, "n/a", "customers: 'n/a' is not a number"),
+        (ingest._date, "someday", "customers: 'someday' is not a date"),
+    ):
+        with pytest.raises(ingest.CellError, match=message):
+            read(value, "customers")
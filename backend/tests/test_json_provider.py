@@ -0,0 +1,43 @@
+import enum
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import orjson
+import pytest
+from flask import Flask
+
+from app.helpers.json_provider import OrjsonProvider
+
+
+class Status(enum.Enum):
+    ACTIVE = "Active"
+
+
+@pytest.fixture
+def provider():
+    return OrjsonProvider(Flask(__name__))
+
+
+def test_column_types_serialize(provider):
+    value = {
+        "id": uuid.UUID(int=1),
+        "day": date(2024, 5, 1),
+        "at": datetime(2024, 5, 1, 9, 30),
+        "time": time(9, 30),
+        "income": Decimal("1250.50"),
+        "status": Status.ACTIVE,
+    }
+    assert orjson.loads(provider.dumps(value)) == {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "day": "2024-05-01",
+        "at": "2024-05-01T09:30:00",
+        "time": "09:30:00",
+        "income": 1250.5,
+        "status": "Active",
+    }
+
+
+def test_unknown_types_raise(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"error": ValueError("boom")})
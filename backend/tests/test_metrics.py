@@ -0,0 +1,31 @@
+import time
+
+import pytest
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.helpers import metrics
+
+FAILING = "DO $$ BEGIN PERFORM pg_sleep(0.2); RAISE EXCEPTION 'boom'; END $$"
+
+
+def test_failed_statements_are_timed_without_inflating_later_ones(app):
+    with app.test_request_context("/"):
+        metrics._start_request()
+        stats = g.request_stats
+
+        with pytest.raises(SQLAlchemyError):
+            db.session.execute(text(FAILING))
+        db.session.rollback()
+        assert stats["statements"][FAILING] == 1
+        assert stats["db_time"] >= 0.2
+
+        # A start time left behind by the failed statement would bill this pause to the next one
+        failed_time = stats["db_time"]
+        time.sleep(0.2)
+        db.session.execute(text("SELECT 1"))
+        assert stats["statements"]["SELECT 1"] == 1
+        assert stats["db_time"] - failed_time < 0.1
+        db.session.remove()
@@ -0,0 +1,49 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.helpers.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at, record_id = datetime(2025, 3, 1, 12, 30, 15, 123456), uuid4()
+    assert decode_cursor(encode_cursor(created_at, record_id)) == (created_at, record_id)
+
+
+def test_cursor_without_created_at_round_trips():
+    record_id = uuid4()
+    assert decode_cursor(encode_cursor(None, record_id)) == (None, record_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(datetime(2025, 1, 1), "x")])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def _walk(client, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_pages_visit_every_candidate_once_in_order(client, make_candidate, order):
+    created = [make_candidate(i) for i in range(7)]
+
+    ids = _walk(client, f"/api/v1/candidates/get-all?limit=3&order={order}")
+
+    assert ids == (created if order == "asc" else created[::-1])
+
+
+def test_invalid_cursor_is_a_bad_request(client):
+    response = client.get("/api/v1/candidates/get-all?cursor=garbage")
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
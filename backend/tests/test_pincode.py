@@ -0,0 +1,29 @@
+import pandas as pd
+
+from app.helpers.pincode import PincodeIndex
+
+PLACES = pd.DataFrame({
+    "postal_code": ["571101", "571102", "571105", "571105"],
+    "place_name": ["Hunsur", "Hunsur Bazar", "Bilikere", "Bilikere Hobli"],
+    "county_name": ["Mysore"] * 4,
+    "state_name": ["Karnataka"] * 4,
+    "community_name": [None, "Hunsur", None, "Piriyapatna"],
+})
+
+
+def test_reverse_lookup_matches_the_taluk_before_post_office_names():
+    index = PincodeIndex.from_dataframe(PLACES)
+
+    assert index.reverse_lookup("Karnataka", "Mysore", "piriyapatna", district_fallback=False) == "571105"
+    assert index.reverse_lookup("Karnataka", "Mysore", "Hunsur", district_fallback=False) == "571102"
+    assert index.reverse_lookup("Karnataka", "Mysore", "Bilikere", district_fallback=False) == "571105"
+    assert index.reverse_lookup("Karnataka", "Mysore", "Nowhere", district_fallback=False) is None
+    assert index.reverse_lookup("Karnataka", "Mysore", "Nowhere") == "571101"
+
+
+def test_snapshot_keeps_taluks(tmp_path):
+    path = str(tmp_path / "pincodes.npz")
+    PincodeIndex.from_dataframe(PLACES).save(path)
+
+    assert PincodeIndex.has_taluks(path)
+    assert PincodeIndex.load(path).reverse_lookup("Karnataka", "Mysore", "Piriyapatna", False) == "571105"
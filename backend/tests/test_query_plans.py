@@ -0,0 +1,8 @@
+from app.helpers.indexes import check_query_plans_command
+
+
+def test_hot_queries_are_served_by_indexes(app, client):
+    result = app.test_cli_runner().invoke(check_query_plans_command)
+
+    assert result.exit_code == 0, result.output
+    assert "SEQ SCAN" not in result.output
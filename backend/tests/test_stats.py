@@ -0,0 +1,19 @@
+def test_assessment_stats_fold_counts_into_their_training(client, make_candidate):
+    candidate_id = make_candidate(1)
+    for training, mark, status in [("Bookkeeping", 35, "Fail"), ("Bookkeeping", 80, "Pass"),
+                                   ("Bookkeeping", None, None), ("Pricing", 95, "Pass")]:
+        response = client.post("/api/v1/assessment/create", json={
+            "candidate_id": candidate_id, "training": training, "date": "2024-05-01",
+            "mark": mark, "status": status,
+        })
+        assert response.status_code == 201, response.get_json()
+
+    response = client.get("/api/v1/stats/assessment?bins=4")
+    assert response.status_code == 200
+    bookkeeping, pricing = response.get_json()["trainings"]
+
+    assert bookkeeping["training"] == "Bookkeeping"
+    assert (bookkeeping["records"], bookkeeping["count"]) == (3, 2)
+    assert [b["count"] for b in bookkeeping["histogram"]] == [0, 1, 0, 1]
+    assert {s["status"]: s["count"] for s in bookkeeping["status"]} == {"Fail": 1, "Pass": 1, None: 1}
+    assert [b["count"] for b in pricing["histogram"]] == [0, 0, 0, 1]
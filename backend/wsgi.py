@@ -0,0 +1,8 @@
+# wsgi.py
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+from app import create_app
+from app.helpers.pincode import get_pincode_index
+
+app = create_app()
+# Refuse to start without the offline pincode snapshot instead of failing every lookup
+get_pincode_index()
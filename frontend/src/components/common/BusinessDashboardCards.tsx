@@ -12,8 +12,7 @@ import {
   Text,
 } from "@chakra-ui/react";
 import { FaRupeeSign, FaUsers } from "react-icons/fa";
-import { getAllBusiness } from "../../helpers/business.service";
-import { BusinessModel } from "../../helpers/business.model";
+import { getBusinessStats } from "../../helpers/stats.service";
 
 interface BusinessStats {
   avgIncomeBefore: number;
@@ -36,25 +35,16 @@ const BusinessDashboardCards: React.FC = () => {
   useEffect(() => {
     const fetchBusinessData = async () => {
       try {
-        const data: BusinessModel[] = await getAllBusiness();
+        const { groups } = await getBusinessStats();
 
-        if (!data.length) return;
+        if (!groups.length || !groups[0].records) return;
 
-        const n = data.length;
-
-        // Calculate averages
-        const avgIncomeBefore = Math.round(
-          data.reduce((sum, b) => sum + (b.income_before ?? 0), 0) / n
-        );
-        const avgIncomeAfter = Math.round(
-          data.reduce((sum, b) => sum + (b.income_after ?? 0), 0) / n
-        );
-        const avgCustomersBefore = Math.round(
-          data.reduce((sum, b) => sum + (b.customers_before ?? 0), 0) / n
-        );
-        const avgCustomersAfter = Math.round(
-          data.reduce((sum, b) => sum + (b.customers_after ?? 0), 0) / n
-        );
+        // Averages are computed server-side over records reporting each metric
+        const [totals] = groups;
+        const avgIncomeBefore = Math.round(totals.income_before.avg ?? 0);
+        const avgIncomeAfter = Math.round(totals.income_after.avg ?? 0);
+        const avgCustomersBefore = Math.round(totals.customers_before.avg ?? 0);
+        const avgCustomersAfter = Math.round(totals.customers_after.avg ?? 0);
 
         setStats({
           avgIncomeBefore,
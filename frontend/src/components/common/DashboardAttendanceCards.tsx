@@ -11,8 +11,7 @@ import {
   Text,
 } from "@chakra-ui/react";
 import { FaChartLine, FaMobileAlt, FaBook } from "react-icons/fa";
-import { getAllAttendance } from "../../helpers/attendance.service";
-import { AttendanceModel } from "../../helpers/attendance.model";
+import { getAttendanceStats, SessionStats } from "../../helpers/attendance.service";
 
 interface AttendanceCounts {
   digitalMarketing: number;
@@ -27,7 +26,7 @@ const DashboardAttendanceCards: React.FC = () => {
     financialLiteracy: 0,
   });
 
-  const [attendanceData, setAttendanceData] = useState<AttendanceModel[]>([]);
+  const [sessionStats, setSessionStats] = useState<SessionStats[]>([]);
 
   const cardBg = useColorModeValue("white", "gray.800");
   const cardShadow = useColorModeValue("md", "dark-lg");
@@ -35,8 +34,8 @@ const DashboardAttendanceCards: React.FC = () => {
   useEffect(() => {
     const fetchAttendance = async () => {
       try {
-        const data = await getAllAttendance();
-        setAttendanceData(data);
+        const data = await getAttendanceStats();
+        setSessionStats(data.sessions);
       } catch (error) {
         console.error("Failed to fetch attendance records", error);
       }
@@ -45,22 +44,16 @@ const DashboardAttendanceCards: React.FC = () => {
   }, []);
 
   useEffect(() => {
-    // Function to count unique candidate IDs per session
-    const countUniqueBySession = (sessionName: string) => {
-      const candidatesSet = new Set(
-        attendanceData
-          .filter((a) => a.session_name?.includes(sessionName))
-          .map((a) => a.candidate_id) // Use candidate_id or unique field
-      );
-      return candidatesSet.size;
-    };
+    // Unique candidates per session, counted server-side
+    const countUniqueBySession = (sessionName: string) =>
+      sessionStats.find((s) => s.session === sessionName)?.candidates ?? 0;
 
     setCounts({
       digitalMarketing: countUniqueBySession("Digital Marketing"),
       digitalPayments: countUniqueBySession("Digital Payments"),
       financialLiteracy: countUniqueBySession("Financial Literacy"),
     });
-  }, [attendanceData]);
+  }, [sessionStats]);
 
   const cardData = [
     { label: "Digital Marketing", count: counts.digitalMarketing, icon: FaChartLine, color: "teal.500" },
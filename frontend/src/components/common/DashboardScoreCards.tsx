@@ -9,12 +9,7 @@ import {
   useColorModeValue,
 } from "@chakra-ui/react";
 import { FaUsers, FaMale, FaFemale, FaCheckCircle, FaBan } from "react-icons/fa";
-import { getAllCandidates } from "../../helpers/registration.service";
-
-interface Candidate {
-  status?: string;
-  gender?: string;
-}
+import { getCandidateStats, subscribeDashboardStats, CandidateStats } from "../../helpers/stats.service";
 
 const DashboardStats = () => {
   const [stats, setStats] = useState({
@@ -30,28 +25,40 @@ const DashboardStats = () => {
   const labelColor = useColorModeValue("gray.500", "gray.400");
   const borderColor = useColorModeValue("gray.200", "gray.600");
 
+  const applyStats = useCallback((data: CandidateStats) => {
+    setStats({
+      total: data.total,
+      active: data.status["Active"] ?? 0,
+      discontinued: data.status["Inactive"] ?? 0,
+      male: data.gender["Male"] ?? 0,
+      female: data.gender["Female"] ?? 0,
+    });
+  }, []);
+
   // 🔥 Prevent re-render loop using useCallback
   const fetchData = useCallback(async () => {
     try {
-      const data: Candidate[] = await getAllCandidates();
-
-      setStats({
-        total: data.length,
-        active: data.filter((d) => d.status?.toLowerCase() === "active").length,
-        discontinued: data.filter((d) => d.status?.toLowerCase() === "inactive").length,
-        male: data.filter((d) => d.gender?.toLowerCase() === "male").length,
-        female: data.filter((d) => d.gender?.toLowerCase() === "female").length,
-      });
+      applyStats(await getCandidateStats());
     } catch (error) {
       console.error("Error fetching stats:", error);
     }
-  }, []);
+  }, [applyStats]);
 
+  // The server pushes new counts after each change; poll only if the stream is refused
   useEffect(() => {
-    fetchData();
-    const interval = setInterval(fetchData, 5000);
-    return () => clearInterval(interval);
-  }, [fetchData]); // ✔ Fixed warning
+    let interval: ReturnType<typeof setInterval> | undefined;
+    const unsubscribe = subscribeDashboardStats(
+      (data) => applyStats(data.candidates),
+      () => {
+        fetchData();
+        interval = setInterval(fetchData, 5000);
+      }
+    );
+    return () => {
+      unsubscribe();
+      if (interval) clearInterval(interval);
+    };
+  }, [applyStats, fetchData]);
 
   return (
     <SimpleGrid columns={{ base: 1, md: 3 }} spacing={6}>
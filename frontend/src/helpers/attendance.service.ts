@@ -11,10 +11,16 @@ export const createAttendance = async (data: AttendanceModel): Promise<{ message
   return response.data;
 };
 
-// Get All Attendance Records
+// Get All Attendance Records (follows the keyset cursor page by page)
 export const getAllAttendance = async (): Promise<AttendanceModel[]> => {
-  const response = await axios.get(`${API_URL}/get-all`);
-  return response.data as AttendanceModel[];
+  const records: AttendanceModel[] = [];
+  let cursor: string | null = null;
+  do {
+    const response = await axios.get(`${API_URL}/get-all`, { params: { limit: 1000, cursor } });
+    records.push(...(response.data.items as AttendanceModel[]));
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return records;
 };
 
 // Get Attendance by ID
@@ -51,3 +57,24 @@ export const deleteAllAttendance = async (): Promise<{ message: string }> => {
   const response = await axios.delete(`${API_URL}/delete-all`);
   return response.data;
 };
+
+export interface SessionCounts {
+  attended: number;
+  absent: number;
+  candidates: number;
+}
+
+export interface SessionStats extends SessionCounts {
+  session: string;
+  dates: (SessionCounts & { date: string })[];
+}
+
+// Per-session attendance rollups computed server-side
+export const getAttendanceStats = async (params?: {
+  session?: string;
+  date_from?: string;
+  date_to?: string;
+}): Promise<{ sessions: SessionStats[] }> => {
+  const response = await axios.get(`${API_URL}/stats`, { params });
+  return response.data;
+};
@@ -11,10 +11,16 @@ export const createBusiness = async (data: BusinessModel): Promise<{ message: st
   return response.data;
 };
 
-// Get all business data
+// Get all business data (follows the keyset cursor page by page)
 export const getAllBusiness = async (): Promise<BusinessModel[]> => {
-  const response = await axios.get(API_URL);
-  return response.data;
+  const records: BusinessModel[] = [];
+  let cursor: string | null = null;
+  do {
+    const response = await axios.get(API_URL, { params: { limit: 1000, cursor } });
+    records.push(...(response.data.items as BusinessModel[]));
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return records;
 };
 
 // Get business record by ID
@@ -0,0 +1,44 @@
+// src/helpers/import.service.ts
+
+import axios from "axios";
+
+const API_URL = "https://msme.winvinayafoundation.org/api/v1/imports";
+
+export type ImportKind = "candidates" | "attendance" | "assessment" | "business";
+
+export interface ImportJob {
+  id: string;
+  kind: ImportKind;
+  filename: string | null;
+  status: "queued" | "running" | "completed" | "failed";
+  total_rows: number | null;
+  processed_rows: number;
+  inserted: number;
+  failed: number;
+  progress: number | null;
+  message: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  errors?: { row: number; error: string }[];
+}
+
+// Upload an .xlsx sheet; the server imports it in the background
+export const startImport = async (kind: ImportKind, file: File) => {
+  const form = new FormData();
+  form.append("file", file);
+  const response = await axios.post(`${API_URL}/${kind}`, form);
+  return response.data as { job_id: string; status: string; status_url: string };
+};
+
+// Poll a job's progress and row errors
+export const getImportJob = async (id: string): Promise<ImportJob> => {
+  const response = await axios.get(`${API_URL}/${id}`);
+  return response.data as ImportJob;
+};
+
+// Most recent jobs, without their row errors
+export const listImportJobs = async (): Promise<ImportJob[]> => {
+  const response = await axios.get(API_URL);
+  return response.data as ImportJob[];
+};
@@ -1,5 +1,8 @@
 // registration.model.ts
 
+import { AttendanceModel } from "./attendance.model";
+import { BusinessModel } from "./business.model";
+
 export type Gender = "" | "Male" | "Female";
 export type PhoneType = "" | "Smart Phone" | "Basic Phone";
 export type CandidateStatus = "Active" | "Inactive"; // If backend uses Inactive
@@ -23,3 +26,29 @@ export interface CandidateRegistration {
 }
 
 export interface CandidateRegistrationModel extends CandidateRegistration {}
+
+// Candidate 360 view returned by /candidates/<id>/full and /candidates/full
+export interface CandidateSummary {
+  sessions_total: number;
+  sessions_attended: number;
+  attendance_rate: number | null;
+  latest_assessment_mark: number | null;
+  latest_assessment_date: string | null;
+  income_delta: number | null;
+  customers_delta: number | null;
+}
+
+export interface CandidateFull extends CandidateRegistration {
+  summary: CandidateSummary;
+  attendance: Omit<AttendanceModel, "candidate_id">[];
+  assessments: {
+    id: string;
+    training: string;
+    date: string;
+    status: string | null;
+    mark: number | null;
+    remarks: string | null;
+    created_at: string | null;
+  }[];
+  business: Omit<BusinessModel, "candidate_id">[];
+}
@@ -1,7 +1,7 @@
 // registration.service.ts
 
 import axios from "axios";
-import { CandidateRegistration } from "./registration.model";
+import { CandidateFull, CandidateRegistration } from "./registration.model";
 
 const API_URL = "https://msme.winvinayafoundation.org/api/v1/candidates"; // Change if needed
 
@@ -11,10 +11,16 @@ export const createCandidate = async (data: CandidateRegistration) => {
 	return response.data;
 };
 
-// Get All Candidates
+// Get All Candidates (follows the keyset cursor page by page)
 export const getAllCandidates = async () => {
-	const response = await axios.get(`${API_URL}/get-all`);
-	return response.data as CandidateRegistration[];
+	const candidates: CandidateRegistration[] = [];
+	let cursor: string | null = null;
+	do {
+		const response = await axios.get(`${API_URL}/get-all`, { params: { limit: 1000, cursor } });
+		candidates.push(...(response.data.items as CandidateRegistration[]));
+		cursor = response.data.next_cursor;
+	} while (cursor);
+	return candidates;
 };
 
 // Get Candidate by ID
@@ -23,6 +29,24 @@ export const getCandidateById = async (id: string) => {
 	return response.data as CandidateRegistration;
 };
 
+// Fuzzy search by name / district / taluk, best matches first
+export const searchCandidates = async (params: { name?: string; district?: string; taluk?: string; limit?: number }) => {
+	const response = await axios.get(`${API_URL}/search`, { params });
+	return response.data.items as (CandidateRegistration & { score: number })[];
+};
+
+// Get one Candidate with attendance, assessments, business and summary figures
+export const getCandidateFull = async (id: string) => {
+	const response = await axios.get(`${API_URL}/${id}/full`);
+	return response.data as CandidateFull;
+};
+
+// Get one page of Candidates with their child records (pass next_cursor back for the next page)
+export const getCandidatesFullPage = async (params: { limit?: number; cursor?: string | null } = {}) => {
+	const response = await axios.get(`${API_URL}/full`, { params });
+	return response.data as { items: CandidateFull[]; next_cursor: string | null };
+};
+
 // Update Candidate by ID
 export const updateCandidateById = async (id: string, data: Partial<CandidateRegistration>) => {
 	const response = await axios.put(`${API_URL}/update/${id}`, data);
@@ -0,0 +1,182 @@
+// src/helpers/stats.service.ts
+
+import axios from "axios";
+
+const API_URL = "https://msme.winvinayafoundation.org/api/v1/stats";
+
+export interface CandidateStats {
+  total: number;
+  status: Record<string, number>;
+  gender: Record<string, number>;
+  phone_type: Record<string, number>;
+  udyam_certificate: Record<string, number>;
+  disability_cat: Record<string, number>;
+}
+
+// Candidate counts computed server-side
+export const getCandidateStats = async (): Promise<CandidateStats> => {
+  const response = await axios.get(`${API_URL}/candidates`);
+  return response.data as CandidateStats;
+};
+
+export interface MetricStats {
+  count: number;
+  sum: number | null;
+  avg: number | null;
+  min: number | null;
+  max: number | null;
+  p25: number | null;
+  median: number | null;
+  p75: number | null;
+  p90: number | null;
+}
+
+export interface BusinessStatsGroup {
+  group?: string;
+  records: number;
+  income_before: MetricStats;
+  income_after: MetricStats;
+  customers_before: MetricStats;
+  customers_after: MetricStats;
+}
+
+// Business KPIs aggregated server-side, optionally grouped by a candidate attribute
+export const getBusinessStats = async (
+  groupBy?: "state" | "district" | "gender" | "udyam_certificate"
+): Promise<{ group_by: string | null; groups: BusinessStatsGroup[] }> => {
+  const response = await axios.get(`${API_URL}/business`, { params: { group_by: groupBy } });
+  return response.data;
+};
+
+export interface AttendanceStats {
+  total: number;
+  attended: number;
+  attendance_rate: number | null;
+  candidates: number;
+}
+
+// Attendance totals computed server-side
+export const getAttendanceStats = async (): Promise<AttendanceStats> => {
+  const response = await axios.get(`${API_URL}/attendance`);
+  return response.data as AttendanceStats;
+};
+
+export interface DashboardStats {
+  changed: string[];
+  candidates: CandidateStats;
+  attendance: AttendanceStats;
+  business: { group_by: null; groups: BusinessStatsGroup[] };
+}
+
+// Server-sent dashboard aggregates: current values on connect, then one event per change.
+// onClosed fires when the server refuses or ends the stream for good (e.g. too many streams).
+export const subscribeDashboardStats = (
+  onStats: (stats: DashboardStats) => void,
+  onClosed?: () => void
+) => {
+  const source = new EventSource(`${API_URL}/stream`);
+  source.addEventListener("stats", (event) => onStats(JSON.parse((event as MessageEvent).data)));
+  source.onerror = () => {
+    // EventSource reconnects by itself unless the response was an error status
+    if (source.readyState === EventSource.CLOSED) onClosed?.();
+  };
+  return () => source.close();
+};
+
+export type RegionLevel = "state" | "district" | "taluk";
+
+export interface RegionStats {
+  state: string;
+  district?: string;
+  taluk?: string;
+  candidates: number;
+  active: number;
+  active_ratio: number | null;
+  attendance_records: number;
+  attendance_rate: number | null;
+  assessments: number;
+  mean_mark: number | null;
+  business_records: number;
+  mean_income_uplift: number | null;
+}
+
+// Candidate, attendance, assessment and business figures per region; filter to drill down
+export const getRegionStats = async (
+  level: RegionLevel,
+  filters: { state?: string; district?: string; taluk?: string } = {}
+): Promise<{ level: RegionLevel; filters: Record<string, string>; groups: RegionStats[] }> => {
+  const response = await axios.get(`${API_URL}/regions`, { params: { level, ...filters } });
+  return response.data;
+};
+
+export type SeriesBucket = "day" | "week" | "month";
+
+export interface AttendancePoint {
+  start: string; // first day of the bucket, YYYY-MM-DD
+  records: number;
+  attended: number;
+  attendance_rate: number | null;
+}
+
+export interface AttendanceSeries {
+  bucket: SeriesBucket;
+  date_from: string;
+  date_to: string;
+  filters: Record<string, string>;
+  records: number;
+  attended: number;
+  attendance_rate: number | null;
+  series: AttendancePoint[];
+}
+
+// Attendance rate per day, week or month; the range defaults to the last 365 days
+export const getAttendanceSeries = async (
+  bucket: SeriesBucket = "week",
+  filters: {
+    date_from?: string;
+    date_to?: string;
+    session?: string;
+    district?: string;
+    candidate_id?: string;
+  } = {}
+): Promise<AttendanceSeries> => {
+  const response = await axios.get(`${API_URL}/attendance/series`, { params: { bucket, ...filters } });
+  return response.data;
+};
+
+export interface HistogramBin {
+  from: number;
+  to: number;
+  count: number;
+}
+
+export interface TrainingMarks {
+  training: string;
+  records: number;
+  count: number; // records with a mark
+  mean: number | null;
+  min: number | null;
+  max: number | null;
+  p25: number | null;
+  median: number | null;
+  p75: number | null;
+  p90: number | null;
+  histogram: HistogramBin[];
+  status: { status: string | null; count: number }[];
+}
+
+// Mark distribution per training: summary, percentiles, histogram and status counts
+export const getAssessmentStats = async (
+  filters: {
+    training?: string;
+    district?: string;
+    date_from?: string;
+    date_to?: string;
+    bins?: number;
+    mark_min?: number;
+    mark_max?: number;
+  } = {}
+): Promise<{ filters: Record<string, string>; bins: number; range: [number, number]; trainings: TrainingMarks[] }> => {
+  const response = await axios.get(`${API_URL}/assessment`, { params: filters });
+  return response.data;
+};